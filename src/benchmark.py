@@ -0,0 +1,457 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import datetime
+import subprocess
+import tracemalloc
+import numpy as np
+from engine.engine import Engine
+from engine.engines_registry import ENGINES_REGISTRY, create_engine
+from game_rules import GAME_RULES_REGISTRY, get_game_rules
+from headless import PATTERNS_DIR, create_grid
+from utils import load_pattern_cells, parse_positive_int
+
+REPOSITORY_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR: str = os.path.join(REPOSITORY_DIR, "benchmarks")
+DEFAULT_SIZES: list[str] = ["146x225", "1024x1024", "4096x4096", "8192x8192"]
+DEFAULT_DENSITIES: list[float] = [0.1, 0.35, 0.5]
+# Generations computed again with tracemalloc to measure the peak memory, kept low
+# as tracing slows down the engines allocating many Python objects
+MEMORY_GENERATIONS: int = 4
+
+
+def parse_size(size: str) -> tuple[int, int]:
+    try:
+        nb_rows, nb_cols = (int(value) for value in size.lower().split("x"))
+
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid size '{size}', expected '<rows>x<cols>'"
+        )
+
+    return nb_rows, nb_cols
+
+
+def get_git_commit() -> tuple[str, bool]:
+    try:
+        commit: str = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPOSITORY_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty: bool = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                cwd=REPOSITORY_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        )
+
+    # Results of an installation without git are saved without commit
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+    return commit, dirty
+
+
+def find_pattern_files() -> list[str]:
+    return sorted(
+        os.path.join(directory, filename)
+        for directory, _, filenames in os.walk(PATTERNS_DIR)
+        for filename in filenames
+        if filename.endswith((".json", ".rle"))
+    )
+
+
+def create_soup(nb_rows: int, nb_cols: int, density: float, seed: int) -> np.ndarray:
+    # 16-bit thresholds rather than floats, 4 times less memory for the largest grids
+    random_generator: np.random.Generator = np.random.default_rng(seed)
+
+    return random_generator.integers(
+        0, 1 << 16, (nb_rows, nb_cols), dtype=np.uint16
+    ) < round(density * (1 << 16))
+
+
+def measure_speed(
+    engine: Engine, grid: np.ndarray, min_time: float, max_generations: int
+) -> tuple[int, float, int]:
+    engine.set_grid(grid)
+
+    # The first generation also warms up the buffers and worker processes
+    engine.step()
+
+    nb_generations: int = 0
+    nb_batch_generations: int = 1
+    start_time: float = time.perf_counter()
+    elapsed_time: float = 0
+
+    # Doubling the batches until the minimum time, timing calls only between them
+    while elapsed_time < min_time and nb_generations < max_generations:
+        nb_batch_generations = min(
+            nb_batch_generations, max_generations - nb_generations
+        )
+        engine.advance(nb_batch_generations)
+        nb_generations += nb_batch_generations
+        nb_batch_generations *= 2
+        elapsed_time = time.perf_counter() - start_time
+
+    # Lazy engines only compute the generations when the cells are read
+    population: int = engine.get_population()
+    elapsed_time = time.perf_counter() - start_time
+
+    return nb_generations, elapsed_time, population
+
+
+def measure_peak_memory(
+    engine_name: str, rules, grid: np.ndarray, nb_workers: int
+) -> int:
+    tracemalloc.start()
+
+    try:
+        engine: Engine = create_engine(engine_name, rules, nb_workers)
+
+        try:
+            engine.set_grid(grid)
+            engine.advance(MEMORY_GENERATIONS)
+            engine.get_population()
+
+        finally:
+            engine.close()
+
+        return tracemalloc.get_traced_memory()[1]
+
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(
+    rules_name: str,
+    engine_name: str,
+    grid: np.ndarray,
+    arguments: argparse.Namespace,
+    cell_step_time: float = None,
+) -> dict:
+    nb_rows, nb_cols = grid.shape
+    engine_class: type = ENGINES_REGISTRY[engine_name]
+    rules = get_game_rules(rules_name)
+    result: dict = {
+        "rules": rules_name,
+        "rulestring": rules.rulestring,
+        "engine": engine_name,
+        "rows": nb_rows,
+        "cols": nb_cols,
+    }
+
+    estimated_memory: int = engine_class.estimate_memory(nb_rows, nb_cols)
+
+    if estimated_memory > arguments.max_memory << 20:
+        result["skipped"] = (
+            f"estimated memory {estimated_memory >> 20} MiB above "
+            f"{arguments.max_memory} MiB"
+        )
+        return result
+
+    # A single generation cannot be interrupted, so the cases that would take too
+    # long according to the same case on a smaller grid are skipped
+    if (
+        cell_step_time is not None
+        and cell_step_time * nb_rows * nb_cols > arguments.max_step_time
+    ):
+        result["skipped"] = (
+            f"estimated {cell_step_time * nb_rows * nb_cols:,.1f} s per generation, "
+            f"above {arguments.max_step_time} s"
+        )
+        return result
+
+    try:
+        engine: Engine = create_engine(engine_name, rules, arguments.workers)
+
+    # Some engines do not support some rules
+    except ValueError as error:
+        result["skipped"] = str(error)
+        return result
+
+    try:
+        nb_generations, elapsed_time, population = measure_speed(
+            engine, grid, arguments.min_time, arguments.max_generations
+        )
+
+    finally:
+        engine.close()
+
+    result.update(
+        {
+            "generations": nb_generations,
+            "elapsed_time": elapsed_time,
+            "generations_per_second": nb_generations / max(elapsed_time, 1e-9),
+            "cells_per_second": nb_generations
+            * nb_rows
+            * nb_cols
+            / max(elapsed_time, 1e-9),
+            "final_population": population,
+        }
+    )
+
+    if arguments.memory:
+        result["peak_memory"] = measure_peak_memory(
+            engine_name, rules, grid, arguments.workers
+        )
+
+    return result
+
+
+def iter_workloads(arguments: argparse.Namespace):
+    for nb_rows, nb_cols in sorted(arguments.sizes, key=lambda size: size[0] * size[1]):
+        for density in arguments.densities:
+            yield {"workload": "soup", "density": density}, create_soup(
+                nb_rows, nb_cols, density, arguments.seed
+            )
+
+    # Patterns are small, so they are only placed at the center of the smallest grid
+    nb_rows, nb_cols = min(arguments.sizes, key=lambda size: size[0] * size[1])
+
+    for pattern_file in arguments.patterns:
+        pattern_name, pattern_cells = load_pattern_cells(pattern_file)
+
+        try:
+            grid: np.ndarray = create_grid(pattern_cells, nb_rows, nb_cols, None, None)
+
+        except ValueError:
+            print(f"Skipping {pattern_name}, larger than {nb_rows}x{nb_cols}")
+            continue
+
+        yield {
+            "workload": "pattern",
+            "pattern": os.path.relpath(pattern_file, PATTERNS_DIR),
+        }, grid
+
+
+def get_case_key(result: dict) -> tuple:
+    return (
+        result["rules"],
+        result["engine"],
+        result["rows"],
+        result["cols"],
+        result["workload"],
+        result.get("density"),
+        result.get("pattern"),
+    )
+
+
+def format_result(result: dict, previous_results: dict[tuple, dict]) -> str:
+    workload: str = (
+        f"soup {result['density']:.0%}"
+        if result["workload"] == "soup"
+        else result["pattern"]
+    )
+    size: str = f"{result['rows']}x{result['cols']}"
+    line: str = (
+        f"{result['rules']:<32} {result['engine']:<28} {size:<11} {workload:<34} "
+    )
+
+    if "skipped" in result:
+        return f"{line}skipped: {result['skipped']}"
+
+    line += f"{result['generations_per_second']:>12,.1f} gen/s"
+
+    if "peak_memory" in result:
+        line += f" {result['peak_memory'] / 2**20:>9,.1f} MiB"
+
+    previous_result: dict = previous_results.get(get_case_key(result))
+
+    if previous_result is not None and "generations_per_second" in previous_result:
+        speedup: float = result["generations_per_second"] / max(
+            previous_result["generations_per_second"], 1e-9
+        )
+        line += f"  x{speedup:.2f}"
+
+    return line
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Measure the speed and memory of the rules and engines on random "
+        "soups and pattern files, and save the results as JSON."
+    )
+    parser.add_argument(
+        "-r",
+        "--rules",
+        nargs="+",
+        default=list(GAME_RULES_REGISTRY),
+        help="rules names or B/S rulestrings (default: all the rules)",
+    )
+    parser.add_argument(
+        "-e",
+        "--engines",
+        nargs="+",
+        default=list(ENGINES_REGISTRY),
+        choices=ENGINES_REGISTRY.keys(),
+        metavar="ENGINE",
+        help=f"engines, among: {', '.join(ENGINES_REGISTRY)} (default: all)",
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        nargs="+",
+        type=parse_size,
+        default=[parse_size(size) for size in DEFAULT_SIZES],
+        help=f"grid sizes as <rows>x<cols> (default: {' '.join(DEFAULT_SIZES)})",
+    )
+    parser.add_argument(
+        "-d",
+        "--densities",
+        nargs="*",
+        type=float,
+        default=DEFAULT_DENSITIES,
+        help="densities of living cells of the random soups, none to skip them "
+        f"(default: {' '.join(map(str, DEFAULT_DENSITIES))})",
+    )
+    parser.add_argument(
+        "-p",
+        "--patterns",
+        nargs="*",
+        help="pattern files, none to skip them (default: all the shipped patterns, "
+        "centered on a grid of the smallest size)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=1.0,
+        help="minimum time in seconds measured per case (default: 1)",
+    )
+    parser.add_argument(
+        "--max-generations",
+        type=int,
+        default=1000,
+        help="maximum number of generations per case (default: 1000)",
+    )
+    parser.add_argument(
+        "--max-step-time",
+        type=float,
+        default=5.0,
+        help="skip the cases whose generations would take more seconds, estimated "
+        "from smaller grids (default: 5)",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=int,
+        default=4096,
+        help="skip the cases whose engine would need more MiB (default: 4096)",
+    )
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="do not measure the peak memory, which computes a few generations again",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=parse_positive_int,
+        help="worker processes of the parallel engine (default: all the cores)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the random soups (default: 0)"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="JSON results file (default: benchmarks/<date>_<commit>.json)",
+    )
+    parser.add_argument(
+        "-c",
+        "--compare",
+        help="JSON results file of a previous run, to print the speed ratios",
+    )
+
+    arguments: argparse.Namespace = parser.parse_args()
+
+    if arguments.patterns is None:
+        arguments.patterns = find_pattern_files()
+
+    # Invalid rules are reported before running any case
+    try:
+        for rules_name in arguments.rules:
+            get_game_rules(rules_name)
+
+    except ValueError as error:
+        parser.error(str(error))
+
+    return arguments
+
+
+def main():
+    arguments: argparse.Namespace = parse_arguments()
+    commit, dirty = get_git_commit()
+    date: datetime.datetime = datetime.datetime.now()
+
+    previous_results: dict[tuple, dict] = {}
+
+    if arguments.compare:
+        with open(arguments.compare, encoding="UTF-8") as file:
+            previous_results = {
+                get_case_key(result): result for result in json.load(file)["results"]
+            }
+
+    results: list[dict] = []
+    # Time per generation and per cell of each case on the largest grid so far
+    cell_step_times: dict[tuple, float] = {}
+
+    for workload, grid in iter_workloads(arguments):
+        for rules_name in arguments.rules:
+            for engine_name in arguments.engines:
+                case: tuple = (rules_name, engine_name, *workload.values())
+                result: dict = run_case(
+                    rules_name,
+                    engine_name,
+                    grid,
+                    arguments,
+                    cell_step_times.get(case),
+                )
+                result.update(workload)
+                results.append(result)
+
+                if "generations" in result:
+                    cell_step_times[case] = result["elapsed_time"] / (
+                        result["generations"] * grid.size
+                    )
+                print(format_result(result, previous_results), flush=True)
+
+    benchmark: dict = {
+        "commit": commit,
+        "dirty": dirty,
+        "date": date.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "workers": arguments.workers,
+        "command": sys.argv[1:],
+        "results": results,
+    }
+
+    output: str = arguments.output
+
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(
+            RESULTS_DIR,
+            f"{date:%Y%m%d_%H%M%S}_{(commit or 'unknown')[:8]}"
+            f"{'_dirty' if dirty else ''}.json",
+        )
+
+    with open(output, "w", encoding="UTF-8") as file:
+        json.dump(benchmark, file, indent=4)
+
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
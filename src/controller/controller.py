@@ -1,8 +1,21 @@
+import os
+import time
 import numpy as np
 from PyQt5.QtCore import QObject, pyqtSignal, QTimer
 from PyQt5.QtWidgets import QMessageBox
 from model.pattern import Pattern
-from game_rules import GAME_RULES_REGISTRY
+from model.grid_delta import GridDelta
+from model.timeline import Timeline
+from model.board_snapshot import BoardSnapshot
+from model.phase_profiler import PhaseProfiler
+from model.cycle_detector import CycleDetector
+from model.population_statistics import PopulationStatistics
+from game_rules import get_game_rules
+from engine.engine import Engine
+from engine.engines_registry import ENGINES_REGISTRY, create_engine
+from engine.parallel_engine import ParallelEngine
+from controller.simulation_thread import SimulationThread
+from controller.jump_thread import JumpThread
 from utils import save_pattern_to_file
 
 
@@ -11,13 +24,26 @@ class Controller(QObject):
 
     NB_ROWS: int = 146
     NB_COLS: int = 225
+    JUMP_ENGINE: str = "HashLife (unbounded)"
+    DISPLAY_INTERVAL: int = 16
+    TIMELINE_MEMORY_BUDGET: int = 64 << 20
+    COMPRESSED_SNAPSHOT_EXTENSION: str = ".golz"
+    # Full-size grids of booleans besides the engine: the grid and differences of the
+    # controller, the previous grid, the differences of each generation and of the
+    # display and the two displayed grids of the simulation thread, and the last
+    # grid and differences of the timeline
+    NB_GRID_BUFFERS: int = 9
 
     close_application_signal = pyqtSignal()
 
-    update_scene_signal = pyqtSignal(list)
+    update_scene_signal = pyqtSignal(GridDelta)
     start_simulation_signal = pyqtSignal()
     pause_simulation_signal = pyqtSignal()
     clear_simulation_signal = pyqtSignal()
+    resize_grid_signal = pyqtSignal(np.ndarray)
+    timeline_changed_signal = pyqtSignal(int, int, int)
+    profile_saved_signal = pyqtSignal(str)
+    cycle_detected_signal = pyqtSignal(int, int)
 
     toggle_cells_interaction_signal = pyqtSignal()
     show_hide_grid_signal = pyqtSignal()
@@ -43,55 +69,354 @@ class Controller(QObject):
         self._initialized = True
 
         self.grid: np.ndarray = np.full((self.NB_ROWS, self.NB_COLS), False, dtype=bool)
+        self.grid_edited: bool = False
+        self._changed_cells: np.ndarray = np.empty_like(self.grid)
         self.timer: QTimer = QTimer()
-        self.timer.timeout.connect(self._step_simulation)
+        self.timer.timeout.connect(self._display_simulation)
 
-        self.iteration_limit: int = None
         self.current_iteration: int = None
+        self.generation: int = 0
+        self.timeline: Timeline = Timeline(memory_budget=self.TIMELINE_MEMORY_BUDGET)
+        self.statistics: PopulationStatistics = PopulationStatistics()
+        self.cycle_detector: CycleDetector = CycleDetector()
+        self._reset_history()
+        self.pause_on_cycle: bool = False
         self.rules = None
+        self.engine: Engine = None
+        # Worker processes of the parallel engine
+        self.nb_workers: int = os.cpu_count() or 1
+        self.simulation_thread: SimulationThread = None
+        self.jump_thread: JumpThread = None
+
+        # Durations of the phases of the generations, only recorded while shown
+        self.profiler: PhaseProfiler = None
+        self._profile_generations: int = 0
 
     def close_application(self):
         self.close_application_signal.emit()
 
     def toggle_cell_alive(self, row: int, col: int):
         self.grid[row, col] = not self.grid[row, col]
+        self.grid_edited = True
+
+    def set_cells_alive(self, rows: np.ndarray, cols: np.ndarray):
+        self.grid[rows, cols] = True
+        self.grid_edited = True
 
-    def start_simulation(self, rules: str, speed: int, iterations: int):
+    def start_simulation(self, rules: str, engine: str, speed: int, iterations: int):
         self.start_simulation_signal.emit()
         self.toggle_cells_interaction_signal.emit()
 
-        self.rules = GAME_RULES_REGISTRY.get(rules)
-
-        self.iteration_limit = iterations
+        self.rules = get_game_rules(rules)
+        resumed_from_past: bool = self.generation != self.timeline.last_generation
+
+        # Resuming the latest generation with the same engine keeps the cells the
+        # sparse engine holds outside of the grid, the grid is only reloaded if it
+        # has been edited. Those cells belong to the latest generation, so resuming
+        # from a past one selected in the timeline starts a new engine.
+        if (
+            type(self.engine) is not ENGINES_REGISTRY[engine]
+            or self.engine.rules is not self.rules
+            or resumed_from_past
+        ):
+            self.close_engine()
+            self.engine = create_engine(engine, self.rules, self.nb_workers)
+            self.engine.set_grid(self.grid)
+
+        elif self.grid_edited:
+            self.engine.set_grid(self.grid)
+
+        # Edited cells start a new history, resuming from a past generation forgets
+        # the following ones
+        if self.grid_edited:
+            self._reset_history()
+
+        elif resumed_from_past:
+            self.timeline.truncate(self.generation)
+            self.statistics.reset(self.grid, self.generation)
+
+        self.grid_edited = False
         self.current_iteration = 0
+        self.cycle_detector.reset(self.grid, self.generation)
+
+        # The thread copies the generations it displays into the grid given
+        self.simulation_thread = SimulationThread(
+            self.engine,
+            speed,
+            iterations,
+            self.timeline,
+            self.cycle_detector,
+            self.statistics,
+            self.grid.copy(),
+        )
+        self.simulation_thread.iteration_limit_reached_signal.connect(
+            self.pause_simulation
+        )
+        self.simulation_thread.profile_saved_signal.connect(
+            self.profile_saved_signal.emit
+        )
+        self.simulation_thread.cycle_detected_signal.connect(self.report_cycle)
+        self.simulation_thread.profiler = self.profiler
+
+        if self._profile_generations:
+            self.simulation_thread.capture_profile(self._profile_generations)
+            self._profile_generations = 0
+
+        self.simulation_thread.start()
+        self.timer.start(self.DISPLAY_INTERVAL)
+
+    def check_rules(self, rules: str, engine: str) -> bool:
+        try:
+            ENGINES_REGISTRY[engine](get_game_rules(rules))
 
-        interval: int = int(1000 / speed)
-        self.timer.start(interval)
+        except ValueError as error:
+            self._show_error("Invalid rules", str(error))
+
+            return False
+
+        return True
+
+    def _show_error(self, title: str, text: str):
+        error_dialog = QMessageBox()
+        error_dialog.setWindowTitle(title)
+        error_dialog.setText(text)
+        error_dialog.setIcon(QMessageBox.Warning)
+        error_dialog.setStandardButtons(QMessageBox.Ok)
+        error_dialog.setModal(True)
+        error_dialog.exec_()
 
     def pause_simulation(self):
-        self.timer.stop()
+        # The iteration limit may be reached while pausing
+        if self.simulation_thread is None:
+            return
+
+        self._stop_simulation_thread()
+        # Copied, as some engines step into the grid they return when resumed
+        self._update_grid(np.copy(self.engine.get_grid()))
+        self._update_timeline()
+
         self.toggle_cells_interaction_signal.emit()
         self.pause_simulation_signal.emit()
 
+    def set_nb_workers(self, nb_workers: int):
+        self.nb_workers = nb_workers
+
+        # The parallel engine is started again with the new number of workers, it
+        # keeps nothing besides the grid
+        if (
+            isinstance(self.engine, ParallelEngine)
+            and self.engine.nb_workers != nb_workers
+        ):
+            self.close_engine()
+
+    def report_cycle(self, first_generation: int, period: int):
+        self.cycle_detected_signal.emit(first_generation, period)
+
+        if self.pause_on_cycle:
+            self.pause_simulation()
+
+    def set_pause_on_cycle(self, enabled: bool):
+        self.pause_on_cycle = enabled
+
     def clear_simulation(self):
-        self.grid = np.full((self.NB_ROWS, self.NB_COLS), False, dtype=bool)
+        self.grid.fill(False)
+        self.close_engine()
+        self.generation = 0
+        self._reset_history()
         self.clear_simulation_signal.emit()
+        self._update_timeline()
+
+    def _display_simulation(self):
+        snapshot: tuple[np.ndarray, GridDelta] = self.simulation_thread.take_snapshot()
+
+        if snapshot is not None:
+            self.grid, delta = snapshot
+            update_time: float = time.perf_counter()
+            self.update_scene_signal.emit(delta)
+
+            if self.profiler is not None:
+                self.profiler.record("Scene update", time.perf_counter() - update_time)
+
+        self.current_iteration = self.simulation_thread.current_iteration
+        self._update_timeline()
+
+    def _stop_simulation_thread(self):
+        if self.simulation_thread is not None:
+            self.timer.stop()
+            self.simulation_thread.stop()
+            self.current_iteration = self.simulation_thread.current_iteration
+            self.simulation_thread = None
+
+    def resize_grid(self, nb_rows: int, nb_cols: int):
+        # Keeping the cells of the top left corner common to both sizes. The current
+        # grid is kept if the new one does not fit in memory.
+        try:
+            grid: np.ndarray = np.full((nb_rows, nb_cols), False, dtype=bool)
+            changed_cells: np.ndarray = np.empty_like(grid)
+
+        except MemoryError:
+            self._show_error(
+                "Grid not resized",
+                f"Not enough memory for a grid of {nb_rows:,} x {nb_cols:,} cells",
+            )
 
-    def _step_simulation(self):
-        if self.iteration_limit and self.current_iteration >= self.iteration_limit:
-            self.pause_simulation()
             return
 
-        new_grid: np.ndarray = self.rules(self.grid)
-        changed_cells: list[tuple[int, int]] = [
-            (x, y)
-            for x in range(self.NB_ROWS)
-            for y in range(self.NB_COLS)
-            if new_grid[x, y] != self.grid[x, y]
+        nb_common_rows: int = min(nb_rows, self.grid.shape[0])
+        nb_common_cols: int = min(nb_cols, self.grid.shape[1])
+        grid[:nb_common_rows, :nb_common_cols] = self.grid[
+            :nb_common_rows, :nb_common_cols
         ]
+
+        self.close_engine()
+        self.grid = grid
+        self.grid_edited = False
+        self._changed_cells = changed_cells
+        self._reset_history()
+
+        self.resize_grid_signal.emit(self.grid)
+        self._update_timeline()
+
+    def estimate_memory(self, nb_rows: int, nb_cols: int, engine: str) -> int:
+        # Grids and differences of the controller, simulation thread and timeline,
+        # image of the grid, plus the engine and the compressed generations of the
+        # timeline. The image has a byte per cell, its lines being 32-bit aligned.
+        grids_memory: int = (
+            self.NB_GRID_BUFFERS * nb_rows * nb_cols * np.dtype(bool).itemsize
+        )
+        image_memory: int = (
+            nb_rows * (-(-nb_cols // 4) * 4) * np.dtype(np.uint8).itemsize
+        )
+
+        return (
+            grids_memory
+            + image_memory
+            + ENGINES_REGISTRY[engine].estimate_memory(nb_rows, nb_cols)
+            + self.TIMELINE_MEMORY_BUDGET
+        )
+
+    def jump_generations(self, rules: str, nb_generations: int):
+        self.start_simulation_signal.emit()
+        self.toggle_cells_interaction_signal.emit()
+
+        engine: Engine = ENGINES_REGISTRY[self.JUMP_ENGINE](get_game_rules(rules))
+        engine.set_grid(self.grid)
+        self.close_engine()
+
+        self.jump_thread = JumpThread(engine, nb_generations)
+        self.jump_thread.jump_finished_signal.connect(self._finish_jump)
+        self.jump_thread.start()
+
+    def _finish_jump(self):
+        jump_thread: JumpThread = self.jump_thread
+        jump_thread.wait()
+        self.jump_thread = None
+
+        self._update_grid(jump_thread.grid)
+        jump_thread.engine.close()
+
+        self.generation += jump_thread.nb_generations
+        self._reset_history()
+        self.grid_edited = False
+        self._update_timeline()
+
+        self.toggle_cells_interaction_signal.emit()
+        self.pause_simulation_signal.emit()
+
+    def save_board(self, filename: str, rules: str):
+        snapshot: BoardSnapshot = BoardSnapshot.from_grid(
+            self.grid, get_game_rules(rules).rulestring, self.generation
+        )
+
+        try:
+            snapshot.save(
+                filename,
+                compressed=filename.endswith(self.COMPRESSED_SNAPSHOT_EXTENSION),
+            )
+
+        except OSError as error:
+            self._show_error("Board not saved", str(error))
+
+    def load_board(self, filename: str) -> str:
+        try:
+            snapshot: BoardSnapshot = BoardSnapshot.load(filename)
+            get_game_rules(snapshot.rulestring)
+
+        except (OSError, ValueError) as error:
+            self._show_error("Board not loaded", str(error))
+
+            return None
+
+        self.close_engine()
+
+        if snapshot.shape != self.grid.shape:
+            self.grid = snapshot.grid
+            self._changed_cells = np.empty_like(self.grid)
+            self.resize_grid_signal.emit(self.grid)
+
+        else:
+            self._update_grid(snapshot.grid)
+
+        self.grid_edited = False
+        self.generation = snapshot.generation
+        self._reset_history()
+        self._update_timeline()
+
+        # Rules the board was saved with, to be selected again
+        return snapshot.rulestring
+
+    def seek_generation(self, generation: int):
+        # Selecting a generation discards the edits made since the last one
+        self._update_grid(self.timeline.get_grid(generation))
+        self.grid_edited = False
+        self._update_timeline(generation)
+        # The cycle detected may start after the selected generation
+        self.cycle_detector.reset(self.grid, generation)
+
+    def set_profiling(self, enabled: bool):
+        self.profiler = PhaseProfiler() if enabled else None
+
+        if self.simulation_thread is not None:
+            self.simulation_thread.profiler = self.profiler
+
+    def capture_profile(self, nb_generations: int):
+        # Profiling the next generations, of the running simulation or the next one
+        if self.simulation_thread is not None:
+            self.simulation_thread.capture_profile(nb_generations)
+
+        else:
+            self._profile_generations = nb_generations
+
+    def close_engine(self):
+        self._stop_simulation_thread()
+
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+
+    def _reset_history(self):
+        # The timeline, statistics and cycle detection start again from the current
+        # generation
+        self.timeline.reset(self.grid, self.generation)
+        self.statistics.reset(self.grid, self.generation)
+        self.cycle_detector.reset(self.grid, self.generation)
+
+    def _update_timeline(self, generation: int = None):
+        self.generation = (
+            self.timeline.last_generation if generation is None else generation
+        )
+        self.timeline_changed_signal.emit(
+            self.timeline.first_generation,
+            self.timeline.last_generation,
+            self.generation,
+        )
+
+    def _update_grid(self, new_grid: np.ndarray):
+        delta: GridDelta = GridDelta.from_grids(
+            self.grid, new_grid, self._changed_cells
+        )
         self.grid = new_grid
-        self.update_scene_signal.emit(changed_cells)
-        self.current_iteration += 1
+        self.update_scene_signal.emit(delta)
 
     def show_games_rules_help(self):
         help_dialog = QMessageBox()
@@ -103,7 +428,9 @@ class Controller(QObject):
             "\n"
             "Example with Conway (B3/S23) rules:\n"
             "- 'B3' means a dead cell becomes alive if it has exactly 3 living neighbors,\n"
-            "- 'S23' means a living cell stays alive if it has 2 or 3 living neighbors."
+            "- 'S23' means a living cell stays alive if it has 2 or 3 living neighbors.\n"
+            "\n"
+            "You can also type any custom rulestring in the rules field, e.g. 'B36/S23'."
         )
         help_dialog.setIcon(QMessageBox.Information)
         help_dialog.setStandardButtons(QMessageBox.Ok)
@@ -136,7 +463,12 @@ class Controller(QObject):
         help_dialog.setWindowTitle("Iterations help")
         help_dialog.setText(
             "The number of iterations is the number of generations the simulation will run before stopping.\n"
-            "If you set it to 0, the simulation will run indefinitely until you pause it."
+            "If you set it to 0, the simulation will run indefinitely until you pause it.\n"
+            "\n"
+            "While paused, 'Jump' computes the given number of generations at once "
+            "with the HashLife engine, on an unbounded plane of which the grid is a window.\n"
+            "The slider below goes back to the previous generations kept in memory, "
+            "starting the simulation from one of them forgets the following ones."
         )
         help_dialog.setIcon(QMessageBox.Information)
         help_dialog.setStandardButtons(QMessageBox.Ok)
@@ -0,0 +1,22 @@
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+from engine.engine import Engine
+
+
+# Computes a jump of many generations outside of the GUI thread, which a large jump
+# would freeze. The jump cannot be interrupted, the GUI only waits for its end.
+class JumpThread(QThread):
+    jump_finished_signal = pyqtSignal()
+
+    def __init__(self, engine: Engine, nb_generations: int):
+        super().__init__()
+
+        self.engine: Engine = engine
+        self.nb_generations: int = nb_generations
+        # Grid after the jump, once finished
+        self.grid: np.ndarray = None
+
+    def run(self):
+        self.engine.advance(self.nb_generations)
+        self.grid = self.engine.get_grid()
+        self.jump_finished_signal.emit()
@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+import cProfile
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+from engine.engine import Engine
+from model.grid_delta import GridDelta
+from model.timeline import Timeline
+from model.phase_profiler import PhaseProfiler
+from model.cycle_detector import CycleDetector
+from model.population_statistics import PopulationStatistics
+
+PROFILES_DIR: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "profiles"
+)
+
+
+# Steps the engine outside of the GUI thread as fast as requested, the GUI takes
+# the latest generation when it refreshes the display and skips the ones between.
+# The differences with the displayed generation are also computed in this thread.
+class SimulationThread(QThread):
+    iteration_limit_reached_signal = pyqtSignal()
+    profile_saved_signal = pyqtSignal(str)
+    cycle_detected_signal = pyqtSignal(int, int)
+
+    def __init__(
+        self,
+        engine: Engine,
+        speed: int,
+        iteration_limit: int,
+        timeline: Timeline,
+        cycle_detector: CycleDetector,
+        statistics: PopulationStatistics,
+        displayed_grid: np.ndarray,
+    ):
+        super().__init__()
+
+        self.engine: Engine = engine
+        self.timeline: Timeline = timeline
+        self.cycle_detector: CycleDetector = cycle_detector
+        self.statistics: PopulationStatistics = statistics
+        # Generations per second, 0 to step as fast as possible
+        self.speed: int = speed
+        self.iteration_limit: int = iteration_limit
+        self.current_iteration: int = 0
+        # Durations of the phases of each generation, only recorded if set
+        self.profiler: PhaseProfiler = None
+
+        self._stop_event: threading.Event = threading.Event()
+        self._snapshot_lock: threading.Lock = threading.Lock()
+        self._snapshot: tuple[np.ndarray, GridDelta] = None
+        self._changed_cells: np.ndarray = np.empty_like(displayed_grid)
+
+        # The cells changed at each generation are found once, for the timeline,
+        # the cycle detection and the statistics
+        self._previous_grid: np.ndarray = displayed_grid.copy()
+        self._step_changed_cells: np.ndarray = np.empty_like(displayed_grid)
+
+        # The generations shown are copied alternately into two buffers, the one not
+        # being displayed is free once the GUI has taken the latest snapshot
+        self._snapshot_grids: list[np.ndarray] = [
+            displayed_grid,
+            np.empty_like(displayed_grid),
+        ]
+
+        # Number of generations still to be profiled with cProfile
+        self._profile_generations: int = 0
+        self._profile: cProfile.Profile = None
+
+    def run(self):
+        interval: float = 1 / self.speed if self.speed else 0
+        next_step_time: float = time.perf_counter()
+
+        while not self._stop_event.is_set():
+            if self.iteration_limit and self.current_iteration >= self.iteration_limit:
+                self.iteration_limit_reached_signal.emit()
+                break
+
+            if interval:
+                if self._stop_event.wait(max(next_step_time - time.perf_counter(), 0)):
+                    break
+
+                # Not catching up on late generations, which would step in bursts
+                next_step_time = max(next_step_time + interval, time.perf_counter())
+
+            if self._profile_generations and self._profile is None:
+                # Profiling starts in this thread, as cProfile only profiles the
+                # thread it is enabled in
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+
+            step_time: float = time.perf_counter()
+            self.engine.step()
+            grid_time: float = time.perf_counter()
+            grid: np.ndarray = self.engine.get_grid()
+            changes_time: float = time.perf_counter()
+            step_delta: GridDelta = GridDelta.from_grids(
+                self._previous_grid, grid, self._step_changed_cells
+            )
+            np.copyto(self._previous_grid, grid)
+            timeline_time: float = time.perf_counter()
+            self.timeline.record(grid, self._step_changed_cells)
+            cycle_time: float = time.perf_counter()
+            cycle: tuple[int, int] = self.cycle_detector.update(step_delta)
+            statistics_time: float = time.perf_counter()
+            self.statistics.update(step_delta)
+            end_time: float = time.perf_counter()
+            self.current_iteration += 1
+
+            if cycle is not None:
+                self.cycle_detected_signal.emit(*cycle)
+
+            profiler: PhaseProfiler = self.profiler
+
+            if profiler is not None:
+                profiler.record("Rules", grid_time - step_time)
+                profiler.record("Get grid", changes_time - grid_time)
+                profiler.record("Changes", timeline_time - changes_time)
+                profiler.record("Timeline", cycle_time - timeline_time)
+                profiler.record("Cycles", statistics_time - cycle_time)
+                profiler.record("Statistics", end_time - statistics_time)
+
+            # The grid is only copied once the previous copy has been displayed
+            if self._snapshot is None:
+                differences_time: float = time.perf_counter()
+                displayed_grid, snapshot_grid = self._snapshot_grids
+                np.copyto(snapshot_grid, grid)
+                delta: GridDelta = GridDelta.from_grids(
+                    displayed_grid, snapshot_grid, self._changed_cells
+                )
+                self._snapshot_grids.reverse()
+
+                with self._snapshot_lock:
+                    self._snapshot = (snapshot_grid, delta)
+
+                if profiler is not None:
+                    profiler.record(
+                        "Differences", time.perf_counter() - differences_time
+                    )
+
+            if self._profile is not None:
+                self._profile_generations -= 1
+
+                if not self._profile_generations:
+                    self._save_profile()
+
+        # Saving the generations profiled before pausing
+        if self._profile is not None:
+            self._save_profile()
+
+    def capture_profile(self, nb_generations: int):
+        self._profile_generations = nb_generations
+
+    def _save_profile(self):
+        self._profile.disable()
+        self._profile_generations = 0
+
+        filename: str = os.path.join(
+            PROFILES_DIR, f"generations_{time.strftime('%Y%m%d_%H%M%S')}.prof"
+        )
+
+        try:
+            os.makedirs(PROFILES_DIR, exist_ok=True)
+            self._profile.dump_stats(filename)
+
+        # An empty file name tells that the profile could not be saved
+        except OSError:
+            filename = ""
+
+        self._profile = None
+        self.profile_saved_signal.emit(filename)
+
+    def take_snapshot(self) -> tuple[np.ndarray, GridDelta]:
+        with self._snapshot_lock:
+            snapshot: tuple[np.ndarray, GridDelta] = self._snapshot
+            self._snapshot = None
+
+        return snapshot
+
+    def stop(self):
+        self._stop_event.set()
+        self.wait()
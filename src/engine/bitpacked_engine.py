@@ -0,0 +1,115 @@
+from typing import Callable
+import numpy as np
+from engine.engine import Engine
+
+WORD_SIZE: int = 64
+ALL_ONES: np.uint64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _full_adder(
+    a: np.ndarray, b: np.ndarray, c: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    a_xor_b: np.ndarray = a ^ b
+
+    return a_xor_b ^ c, (a & b) | (c & a_xor_b)
+
+
+def _half_adder(a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return a ^ b, a & b
+
+
+# Each row is stored as packed 64-bit words, bit i of word w holding the cell of
+# column 64 * w + i, so that every bitwise operation updates 64 cells at once
+class BitPackedEngine(Engine):
+    BYTES_PER_CELL: float = 3.0
+
+    def __init__(self, rules: Callable):
+        super().__init__(rules)
+
+        self.nb_rows: int = 0
+        self.nb_cols: int = 0
+        self.words: np.ndarray = None
+        self.last_word_mask: np.uint64 = ALL_ONES
+
+    def set_grid(self, grid: np.ndarray):
+        self.nb_rows, self.nb_cols = grid.shape
+        nb_words: int = -(-self.nb_cols // WORD_SIZE)
+
+        padded_grid: np.ndarray = np.full(
+            (self.nb_rows, nb_words * WORD_SIZE), False, dtype=bool
+        )
+        padded_grid[:, : self.nb_cols] = grid
+
+        self.words = np.packbits(padded_grid, axis=1, bitorder="little").view("<u8")
+
+        # Bits past the last column must stay dead
+        nb_used_bits: int = self.nb_cols % WORD_SIZE
+        self.last_word_mask = (
+            np.uint64((1 << nb_used_bits) - 1) if nb_used_bits else ALL_ONES
+        )
+
+    def get_grid(self) -> np.ndarray:
+        cells: np.ndarray = np.unpackbits(
+            self.words.view(np.uint8), axis=1, count=self.nb_cols, bitorder="little"
+        )
+
+        return cells.view(bool)
+
+    def step(self):
+        words: np.ndarray = self.words
+        one: np.uint64 = np.uint64(1)
+        last_bit: np.uint64 = np.uint64(WORD_SIZE - 1)
+
+        # Surrounding the rows with dead ones so that vertical neighbors are views
+        padded_words: np.ndarray = np.zeros(
+            (self.nb_rows + 2, words.shape[1]), dtype=words.dtype
+        )
+        padded_words[1:-1] = words
+
+        # Neighbors on the left (west) and on the right (east) of each cell
+        west: np.ndarray = padded_words << one
+        west[:, 1:] |= padded_words[:, :-1] >> last_bit
+        east: np.ndarray = padded_words >> one
+        east[:, :-1] |= padded_words[:, 1:] << last_bit
+
+        north, north_west, north_east = padded_words[:-2], west[:-2], east[:-2]
+        south, south_west, south_east = padded_words[2:], west[2:], east[2:]
+        west, east = west[1:-1], east[1:-1]
+
+        # Adding the 8 neighbor bits of every cell into a 4-bit count
+        sum_1, carry_1 = _full_adder(north_west, north, north_east)
+        sum_2, carry_2 = _full_adder(west, east, south_west)
+        sum_3, carry_3 = _half_adder(south, south_east)
+        count_bit_0, carry_4 = _full_adder(sum_1, sum_2, sum_3)
+        sum_4, carry_5 = _full_adder(carry_1, carry_2, carry_3)
+        count_bit_1, carry_6 = _half_adder(sum_4, carry_4)
+        count_bit_2, count_bit_3 = _half_adder(carry_5, carry_6)
+        count_bits: tuple[np.ndarray, ...] = (
+            count_bit_0,
+            count_bit_1,
+            count_bit_2,
+            count_bit_3,
+        )
+
+        birth: np.ndarray = self._match_counts(count_bits, self.rules.birth)
+        survival: np.ndarray = self._match_counts(count_bits, self.rules.survival)
+
+        new_words: np.ndarray = (~words & birth) | (words & survival)
+        new_words[:, -1] &= self.last_word_mask
+
+        self.words = new_words
+
+    def _match_counts(
+        self, count_bits: tuple[np.ndarray, ...], nb_neighbors: frozenset[int]
+    ) -> np.ndarray:
+        matches: np.ndarray = np.zeros_like(count_bits[0])
+
+        for count in nb_neighbors:
+            count_matches: np.ndarray = np.full_like(count_bits[0], ALL_ONES)
+
+            for bit, count_bit in enumerate(count_bits):
+                count_matches &= count_bit if count >> bit & 1 else ~count_bit
+
+            matches |= count_matches
+
+        return matches
@@ -0,0 +1,31 @@
+from typing import Callable
+import numpy as np
+from engine.engine import Engine
+
+
+# The next generation is written into a second preallocated buffer and both are
+# swapped, so that stepping does not allocate any array
+class DenseEngine(Engine):
+    BYTES_PER_CELL: float = 6.0
+
+    def __init__(self, rules: Callable):
+        super().__init__(rules)
+
+        self.grid: np.ndarray = None
+        self._next_grid: np.ndarray = None
+        self._scratch: np.ndarray = None
+
+    def set_grid(self, grid: np.ndarray):
+        if self.grid is None or self.grid.shape != grid.shape:
+            self.grid = np.empty(grid.shape, dtype=bool)
+            self._next_grid = np.empty(grid.shape, dtype=bool)
+            self._scratch = np.empty(grid.shape, dtype=np.uint32)
+
+        np.copyto(self.grid, grid)
+
+    def get_grid(self) -> np.ndarray:
+        return self.grid
+
+    def step(self):
+        self.rules(self.grid, out=self._next_grid, scratch=self._scratch)
+        self.grid, self._next_grid = self._next_grid, self.grid
@@ -0,0 +1,33 @@
+from typing import Callable
+import numpy as np
+
+
+class Engine:
+    # Memory used per cell of the grid, measured on random soups
+    BYTES_PER_CELL: float = 1.0
+
+    def __init__(self, rules: Callable):
+        self.rules: Callable = rules
+
+    @classmethod
+    def estimate_memory(cls, nb_rows: int, nb_cols: int) -> int:
+        return int(nb_rows * nb_cols * cls.BYTES_PER_CELL)
+
+    def set_grid(self, grid: np.ndarray):
+        raise NotImplementedError
+
+    def get_grid(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def get_population(self) -> int:
+        return int(np.count_nonzero(self.get_grid()))
+
+    def step(self):
+        raise NotImplementedError
+
+    def advance(self, nb_generations: int):
+        for _ in range(nb_generations):
+            self.step()
+
+    def close(self):
+        pass
@@ -0,0 +1,27 @@
+from typing import Callable
+from engine.engine import Engine
+from engine.dense_engine import DenseEngine
+from engine.bitpacked_engine import BitPackedEngine
+from engine.hashlife_engine import HashLifeEngine
+from engine.sparse_engine import SparseEngine
+from engine.tiled_engine import TiledEngine
+from engine.parallel_engine import ParallelEngine
+
+ENGINES_REGISTRY = {
+    "NumPy (dense)": DenseEngine,
+    "Bit-packed (64 cells/word)": BitPackedEngine,
+    "Tiled (active regions)": TiledEngine,
+    "Parallel (all cores)": ParallelEngine,
+    "HashLife (unbounded)": HashLifeEngine,
+    "Sparse (unbounded)": SparseEngine,
+}
+
+
+def create_engine(engine: str, rules: Callable, nb_workers: int = None) -> Engine:
+    # Only the parallel engine has worker processes, all the cores by default
+    engine_class: type = ENGINES_REGISTRY[engine]
+
+    if issubclass(engine_class, ParallelEngine):
+        return engine_class(rules, nb_workers)
+
+    return engine_class(rules)
@@ -0,0 +1,344 @@
+from typing import Callable
+import numpy as np
+from engine.engine import Engine
+
+# Rough size of a node, its entry in the nodes table and its memoized results
+NODE_MEMORY: int = 400
+MAX_MEMORY: int = 512 * 1024 * 1024
+
+
+class Node:
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(
+        self,
+        level: int,
+        nw: "Node" = None,
+        ne: "Node" = None,
+        sw: "Node" = None,
+        se: "Node" = None,
+        population: int = 0,
+    ):
+        self.level: int = level
+        self.nw: Node = nw
+        self.ne: Node = ne
+        self.sw: Node = sw
+        self.se: Node = se
+        self.population: int = population
+
+
+class _NodesLimitReached(Exception):
+    pass
+
+
+DEAD_CELL: Node = Node(0, population=0)
+ALIVE_CELL: Node = Node(0, population=1)
+
+
+# A node of level k is a 2^k x 2^k square made of 4 canonical children of level
+# k - 1, so identical squares are shared and their futures are computed only once
+class HashLifeEngine(Engine):
+    BYTES_PER_CELL: float = 75.0
+
+    def __init__(self, rules: Callable, max_memory: int = MAX_MEMORY):
+        super().__init__(rules)
+
+        if 0 in rules.birth:
+            raise ValueError("HashLife does not support rules with birth on 0")
+
+        self.max_nodes: int = max_memory // NODE_MEMORY
+
+        self._nodes: dict[tuple[Node, Node, Node, Node], Node] = {}
+        self._results: dict[tuple[Node, int], Node] = {}
+        self._empty_nodes: list[Node] = [DEAD_CELL]
+        # Number of nodes and results beyond which the current step is abandoned
+        self._nodes_limit: int = None
+
+        self.nb_rows: int = 0
+        self.nb_cols: int = 0
+        self.root: Node = None
+        # Position of the top left cell of the root in the grid
+        self.origin_row: int = 0
+        self.origin_col: int = 0
+
+    @classmethod
+    def estimate_memory(cls, nb_rows: int, nb_cols: int) -> int:
+        # Nodes are collected beyond the maximum memory, the grid is painted back
+        nb_cells: int = nb_rows * nb_cols
+
+        return min(int(nb_cells * cls.BYTES_PER_CELL), MAX_MEMORY) + nb_cells
+
+    def set_grid(self, grid: np.ndarray):
+        self.nb_rows, self.nb_cols = grid.shape
+
+        level: int = max(2, int(max(grid.shape) - 1).bit_length())
+        size: int = 1 << level
+
+        padded_grid: np.ndarray = np.full((size, size), False, dtype=bool)
+        padded_grid[: self.nb_rows, : self.nb_cols] = grid
+
+        self.root = self._build_node(padded_grid)
+        self.origin_row = 0
+        self.origin_col = 0
+
+    def get_grid(self) -> np.ndarray:
+        grid: np.ndarray = np.full((self.nb_rows, self.nb_cols), False, dtype=bool)
+        self._paint_node(self.root, self.origin_row, self.origin_col, grid)
+
+        return grid
+
+    def get_population(self) -> int:
+        return self.root.population
+
+    def step(self):
+        self.advance(1)
+
+    def advance(self, nb_generations: int):
+        # The generations cannot be computed backwards
+        if nb_generations < 0:
+            raise ValueError(f"Invalid number of generations: {nb_generations}")
+
+        exponent: int = 0
+
+        while nb_generations:
+            if nb_generations & 1:
+                self.advance_power_of_two(exponent)
+
+            nb_generations >>= 1
+            exponent += 1
+
+    def advance_power_of_two(self, exponent: int):
+        # Half of the maximum memory is left for the nodes created by the step
+        if len(self._nodes) + len(self._results) > self.max_nodes // 2:
+            self._collect()
+
+        root: Node = self.root
+        origin_row: int = self.origin_row
+        origin_col: int = self.origin_col
+
+        # A single generation is always computed, even beyond the maximum memory
+        self._nodes_limit = self.max_nodes if exponent else None
+
+        try:
+            # The pattern must fit in the center of the root, and the root must be
+            # large enough for the pattern not to escape within 2^exponent
+            # generations
+            while self.root.level < exponent + 2 or not self._is_centered(self.root):
+                self._expand()
+            self._expand()
+
+            self.origin_row += 1 << (self.root.level - 2)
+            self.origin_col += 1 << (self.root.level - 2)
+            self.root = self._successor(self.root, exponent)
+
+        # A jump needing more nodes than the maximum memory is made again from the
+        # same root in two jumps of half as many generations
+        except _NodesLimitReached:
+            self.root = root
+            self.origin_row = origin_row
+            self.origin_col = origin_col
+            self._collect()
+
+            self.advance_power_of_two(exponent - 1)
+            self.advance_power_of_two(exponent - 1)
+
+        finally:
+            self._nodes_limit = None
+
+    def _collect(self):
+        # Starting a new generation of nodes with the ones of the root, the others
+        # are released
+        self._nodes.clear()
+        self._results.clear()
+        del self._empty_nodes[1:]
+
+        if self.root is not None:
+            self._register_node(self.root)
+
+    def _register_node(self, node: Node):
+        key: tuple[Node, Node, Node, Node] = (node.nw, node.ne, node.sw, node.se)
+
+        if node.level == 0 or key in self._nodes:
+            return
+
+        self._register_node(node.nw)
+        self._register_node(node.ne)
+        self._register_node(node.sw)
+        self._register_node(node.se)
+        self._nodes[key] = node
+
+    def _join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        key: tuple[Node, Node, Node, Node] = (nw, ne, sw, se)
+        node: Node = self._nodes.get(key)
+
+        if node is None:
+            if (
+                self._nodes_limit is not None
+                and len(self._nodes) + len(self._results) >= self._nodes_limit
+            ):
+                raise _NodesLimitReached()
+
+            population: int = (
+                nw.population + ne.population + sw.population + se.population
+            )
+            node = Node(nw.level + 1, nw, ne, sw, se, population)
+            self._nodes[key] = node
+
+        return node
+
+    def _empty_node(self, level: int) -> Node:
+        while len(self._empty_nodes) <= level:
+            empty_child: Node = self._empty_nodes[-1]
+            self._empty_nodes.append(
+                self._join(empty_child, empty_child, empty_child, empty_child)
+            )
+
+        return self._empty_nodes[level]
+
+    def _build_node(self, grid: np.ndarray) -> Node:
+        size: int = grid.shape[0]
+
+        if size == 1:
+            return ALIVE_CELL if grid[0, 0] else DEAD_CELL
+
+        level: int = size.bit_length() - 1
+
+        if not grid.any():
+            return self._empty_node(level)
+
+        half: int = size // 2
+
+        return self._join(
+            self._build_node(grid[:half, :half]),
+            self._build_node(grid[:half, half:]),
+            self._build_node(grid[half:, :half]),
+            self._build_node(grid[half:, half:]),
+        )
+
+    def _paint_node(self, node: Node, row: int, col: int, grid: np.ndarray):
+        size: int = 1 << node.level
+
+        if (
+            node.population == 0
+            or row >= self.nb_rows
+            or col >= self.nb_cols
+            or row + size <= 0
+            or col + size <= 0
+        ):
+            return
+
+        if node.level == 0:
+            grid[row, col] = True
+            return
+
+        half: int = size // 2
+        self._paint_node(node.nw, row, col, grid)
+        self._paint_node(node.ne, row, col + half, grid)
+        self._paint_node(node.sw, row + half, col, grid)
+        self._paint_node(node.se, row + half, col + half, grid)
+
+    def _is_centered(self, node: Node) -> bool:
+        return node.population == (
+            node.nw.se.population
+            + node.ne.sw.population
+            + node.sw.ne.population
+            + node.se.nw.population
+        )
+
+    def _expand(self):
+        root: Node = self.root
+        empty: Node = self._empty_node(root.level - 1)
+
+        self.root = self._join(
+            self._join(empty, empty, empty, root.nw),
+            self._join(empty, empty, root.ne, empty),
+            self._join(empty, root.sw, empty, empty),
+            self._join(root.se, empty, empty, empty),
+        )
+        self.origin_row -= 1 << (root.level - 1)
+        self.origin_col -= 1 << (root.level - 1)
+
+    def _step_4x4(self, node: Node) -> Node:
+        cells: list[list[int]] = [
+            [node.nw.nw.population, node.nw.ne.population]
+            + [node.ne.nw.population, node.ne.ne.population],
+            [node.nw.sw.population, node.nw.se.population]
+            + [node.ne.sw.population, node.ne.se.population],
+            [node.sw.nw.population, node.sw.ne.population]
+            + [node.se.nw.population, node.se.ne.population],
+            [node.sw.sw.population, node.sw.se.population]
+            + [node.se.sw.population, node.se.se.population],
+        ]
+        new_cells: list[Node] = []
+
+        for row, col in ((1, 1), (1, 2), (2, 1), (2, 2)):
+            nb_neighbors: int = (
+                sum(cells[row - 1][col - 1 : col + 2])
+                + cells[row][col - 1]
+                + cells[row][col + 1]
+                + sum(cells[row + 1][col - 1 : col + 2])
+            )
+            nb_neighbors_allowed: frozenset[int] = (
+                self.rules.survival if cells[row][col] else self.rules.birth
+            )
+            new_cells.append(
+                ALIVE_CELL if nb_neighbors in nb_neighbors_allowed else DEAD_CELL
+            )
+
+        return self._join(*new_cells)
+
+    def _successor(self, node: Node, exponent: int) -> Node:
+        # Returns the center of the node, half its size, 2^exponent generations later
+        exponent = min(exponent, node.level - 2)
+
+        if node.population == 0:
+            return self._empty_node(node.level - 1)
+
+        key: tuple[Node, int] = (node, exponent)
+        result: Node = self._results.get(key)
+
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._step_4x4(node)
+
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+
+            # Advancing the 9 overlapping sub-squares of half the node size
+            sub_nodes: list[Node] = [
+                self._successor(sub_node, exponent)
+                for sub_node in (
+                    nw,
+                    self._join(nw.ne, ne.nw, nw.se, ne.sw),
+                    ne,
+                    self._join(nw.sw, nw.se, sw.nw, sw.ne),
+                    self._join(nw.se, ne.sw, sw.ne, se.nw),
+                    self._join(ne.sw, ne.se, se.nw, se.ne),
+                    sw,
+                    self._join(sw.ne, se.nw, sw.se, se.sw),
+                    se,
+                )
+            ]
+            c00, c01, c02, c10, c11, c12, c20, c21, c22 = sub_nodes
+
+            if exponent < node.level - 2:
+                result = self._join(
+                    self._join(c00.se, c01.sw, c10.ne, c11.nw),
+                    self._join(c01.se, c02.sw, c11.ne, c12.nw),
+                    self._join(c10.se, c11.sw, c20.ne, c21.nw),
+                    self._join(c11.se, c12.sw, c21.ne, c22.nw),
+                )
+
+            else:
+                result = self._join(
+                    self._successor(self._join(c00, c01, c10, c11), exponent),
+                    self._successor(self._join(c01, c02, c11, c12), exponent),
+                    self._successor(self._join(c10, c11, c20, c21), exponent),
+                    self._successor(self._join(c11, c12, c21, c22), exponent),
+                )
+
+        self._results[key] = result
+
+        return result
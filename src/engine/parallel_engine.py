@@ -0,0 +1,121 @@
+import os
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable
+import numpy as np
+from engine.engine import Engine
+from game_rules import compile_rules, count_neighbors
+
+# Grids of each worker process, attached to the shared memory of the engine
+_worker_grids: list[np.ndarray] = []
+_worker_shared_memories: list[SharedMemory] = []
+_worker_rules: Callable = None
+
+
+def _init_worker(shared_memories_names: list[str], shape: tuple, rulestring: str):
+    global _worker_rules
+
+    for shared_memory_name in shared_memories_names:
+        shared_memory: SharedMemory = SharedMemory(name=shared_memory_name)
+        _worker_shared_memories.append(shared_memory)
+        _worker_grids.append(np.ndarray(shape, dtype=bool, buffer=shared_memory.buf))
+
+    _worker_rules = compile_rules(rulestring)
+
+
+def _step_band(grid_index: int, first_row: int, last_row: int):
+    grid: np.ndarray = _worker_grids[grid_index]
+    next_grid: np.ndarray = _worker_grids[1 - grid_index]
+
+    # Grids have a dead row above and below, so the band with its one row halo is
+    # rows first_row to last_row + 2 of the padded grid
+    band: np.ndarray = grid[first_row : last_row + 2]
+    new_band: np.ndarray = _worker_rules.lookup_table[
+        band.view(np.uint8), count_neighbors(band)
+    ]
+    next_grid[first_row + 1 : last_row + 1] = new_band[1:-1]
+
+
+# The grid is double buffered in shared memory and split into horizontal bands
+# stepped by a pool of processes, only band bounds are sent to the workers
+class ParallelEngine(Engine):
+    BYTES_PER_CELL: float = 3.0
+
+    def __init__(self, rules: Callable, nb_workers: int = None):
+        super().__init__(rules)
+
+        # All the cores are used by default
+        if nb_workers is not None and nb_workers < 1:
+            raise ValueError(f"Invalid number of workers: {nb_workers}")
+
+        self.nb_workers: int = nb_workers or os.cpu_count() or 1
+
+        self._shared_memories: list[SharedMemory] = []
+        self._grids: list[np.ndarray] = []
+        self._grid_index: int = 0
+        self._bands: list[tuple[int, int]] = []
+        self._pool: Pool = None
+
+    def set_grid(self, grid: np.ndarray):
+        self.close()
+
+        nb_rows, nb_cols = grid.shape
+        shape: tuple[int, int] = (nb_rows + 2, nb_cols)
+
+        for _ in range(2):
+            shared_memory: SharedMemory = SharedMemory(
+                create=True, size=max(1, shape[0] * shape[1])
+            )
+            padded_grid: np.ndarray = np.ndarray(
+                shape, dtype=bool, buffer=shared_memory.buf
+            )
+            padded_grid[:] = False
+            self._shared_memories.append(shared_memory)
+            self._grids.append(padded_grid)
+
+        self._grids[0][1:-1] = grid
+        self._grid_index = 0
+
+        bounds: np.ndarray = np.linspace(0, nb_rows, self.nb_workers + 1, dtype=int)
+        self._bands = [
+            (int(first_row), int(last_row))
+            for first_row, last_row in zip(bounds[:-1], bounds[1:])
+            if last_row > first_row
+        ]
+
+        self._pool = Pool(
+            self.nb_workers,
+            initializer=_init_worker,
+            initargs=(
+                [shared_memory.name for shared_memory in self._shared_memories],
+                shape,
+                self.rules.rulestring,
+            ),
+        )
+
+    def get_grid(self) -> np.ndarray:
+        return self._grids[self._grid_index][1:-1].copy()
+
+    def step(self):
+        self._pool.starmap(
+            _step_band,
+            [
+                (self._grid_index, first_row, last_row)
+                for first_row, last_row in self._bands
+            ],
+        )
+        self._grid_index = 1 - self._grid_index
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+        self._grids.clear()
+
+        for shared_memory in self._shared_memories:
+            shared_memory.close()
+            shared_memory.unlink()
+
+        self._shared_memories.clear()
@@ -0,0 +1,117 @@
+from typing import Callable
+import numpy as np
+from engine.engine import Engine
+
+# Cells are identified by a single integer key, the row in the high bits and the
+# column in the low 32 bits, both shifted so that negative coordinates stay ordered
+COORDINATE_BIAS: int = 1 << 30
+ROW_UNIT: int = 1 << 32
+NEIGHBORS_KEY_OFFSETS: np.ndarray = np.array(
+    [
+        row_offset * ROW_UNIT + col_offset
+        for row_offset in (-1, 0, 1)
+        for col_offset in (-1, 0, 1)
+        if row_offset or col_offset
+    ],
+    dtype=np.int64,
+)
+
+
+def _to_keys(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    return (rows.astype(np.int64) + COORDINATE_BIAS) * ROW_UNIT + (
+        cols.astype(np.int64) + COORDINATE_BIAS
+    )
+
+
+def _from_keys(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return keys // ROW_UNIT - COORDINATE_BIAS, keys % ROW_UNIT - COORDINATE_BIAS
+
+
+# Only the sorted keys of the living cells are stored, so the plane is unbounded
+# and both memory and step cost grow with the population instead of the area
+class SparseEngine(Engine):
+    BYTES_PER_CELL: float = 100.0
+
+    def __init__(self, rules: Callable):
+        super().__init__(rules)
+
+        if 0 in rules.birth:
+            raise ValueError("The sparse engine does not support rules with birth on 0")
+
+        self.keys: np.ndarray = np.empty(0, dtype=np.int64)
+
+        self.nb_rows: int = 0
+        self.nb_cols: int = 0
+        # Position of the displayed grid on the plane, moved to follow living cells
+        self.origin_row: int = 0
+        self.origin_col: int = 0
+
+    def set_grid(self, grid: np.ndarray):
+        self.nb_rows, self.nb_cols = grid.shape
+
+        # Living cells outside the displayed grid are kept
+        outside_keys: np.ndarray = self.keys[~self._in_window(self.keys)]
+        rows, cols = np.nonzero(grid)
+        window_keys: np.ndarray = _to_keys(
+            rows + self.origin_row, cols + self.origin_col
+        )
+
+        self.keys = np.union1d(outside_keys, window_keys)
+
+    def get_grid(self) -> np.ndarray:
+        grid: np.ndarray = np.full((self.nb_rows, self.nb_cols), False, dtype=bool)
+        rows, cols = _from_keys(self.keys[self._in_window(self.keys)])
+        grid[rows - self.origin_row, cols - self.origin_col] = True
+
+        return grid
+
+    def get_population(self) -> int:
+        return len(self.keys)
+
+    def get_bounding_box(self) -> tuple[int, int, int, int]:
+        rows, cols = _from_keys(self.keys)
+
+        return int(rows.min()), int(cols.min()), int(rows.max()), int(cols.max())
+
+    def step(self):
+        if not len(self.keys):
+            return
+
+        # Each living cell adds one to the count of its 8 neighbors, and appears
+        # once itself so that isolated living cells are also candidates
+        neighbors_keys: np.ndarray = (
+            self.keys[:, None] + NEIGHBORS_KEY_OFFSETS[None, :]
+        ).ravel()
+        candidates_keys, nb_occurrences = np.unique(
+            np.concatenate((neighbors_keys, self.keys)), return_counts=True
+        )
+
+        alive_indices: np.ndarray = np.searchsorted(candidates_keys, self.keys)
+        alive: np.ndarray = np.full(len(candidates_keys), False, dtype=bool)
+        alive[alive_indices] = True
+        nb_neighbors: np.ndarray = nb_occurrences - alive
+
+        self.keys = candidates_keys[
+            self.rules.lookup_table[alive.view(np.uint8), nb_neighbors]
+        ]
+
+        self._follow_living_cells()
+
+    def _in_window(self, keys: np.ndarray) -> np.ndarray:
+        rows, cols = _from_keys(keys)
+
+        return (
+            (rows >= self.origin_row)
+            & (rows < self.origin_row + self.nb_rows)
+            & (cols >= self.origin_col)
+            & (cols < self.origin_col + self.nb_cols)
+        )
+
+    def _follow_living_cells(self):
+        if not len(self.keys) or self._in_window(self.keys).all():
+            return
+
+        # Centering the displayed grid on the bounding box of the living cells
+        min_row, min_col, max_row, max_col = self.get_bounding_box()
+        self.origin_row = (min_row + max_row + 1 - self.nb_rows) // 2
+        self.origin_col = (min_col + max_col + 1 - self.nb_cols) // 2
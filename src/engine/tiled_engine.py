@@ -0,0 +1,92 @@
+from typing import Callable
+import numpy as np
+from engine.engine import Engine
+from game_rules import count_neighbors
+
+
+# The grid is split into square tiles flagged when they changed during the last
+# generation, only those tiles and their neighbors can change during the next one
+class TiledEngine(Engine):
+    BYTES_PER_CELL: float = 2.5
+
+    def __init__(self, rules: Callable, tile_size: int = 32):
+        super().__init__(rules)
+
+        self.tile_size: int = tile_size
+
+        self.grid: np.ndarray = None
+        self._next_grid: np.ndarray = None
+        self.active_tiles: np.ndarray = None
+
+    def set_grid(self, grid: np.ndarray):
+        if self.grid is None or self.grid.shape != grid.shape:
+            self.grid = np.empty(grid.shape, dtype=bool)
+            self._next_grid = np.empty(grid.shape, dtype=bool)
+
+        # Both buffers always hold the same cells in inactive tiles
+        np.copyto(self.grid, grid)
+        np.copyto(self._next_grid, grid)
+
+        nb_tile_rows: int = -(-grid.shape[0] // self.tile_size)
+        nb_tile_cols: int = -(-grid.shape[1] // self.tile_size)
+        self.active_tiles = np.full((nb_tile_rows, nb_tile_cols), True, dtype=bool)
+
+    def get_grid(self) -> np.ndarray:
+        return self.grid
+
+    def get_nb_active_tiles(self) -> int:
+        return int(self.active_tiles.sum())
+
+    def step(self):
+        tiles_to_compute: np.ndarray = self.active_tiles.copy()
+        tiles_to_compute[1:, :] |= self.active_tiles[:-1, :]
+        tiles_to_compute[:-1, :] |= self.active_tiles[1:, :]
+        tiles_to_compute[:, 1:] |= tiles_to_compute[:, :-1].copy()
+        tiles_to_compute[:, :-1] |= tiles_to_compute[:, 1:].copy()
+
+        new_active_tiles: np.ndarray = np.full_like(self.active_tiles, False)
+
+        for tile_row, tile_row_to_compute in enumerate(tiles_to_compute):
+            # Computing consecutive tiles of a row of tiles at once
+            bounds: np.ndarray = np.flatnonzero(
+                np.diff(np.concatenate(([0], tile_row_to_compute.view(np.int8), [0])))
+            )
+
+            for first_tile_col, last_tile_col in bounds.reshape(-1, 2):
+                new_active_tiles[tile_row, first_tile_col:last_tile_col] = (
+                    self._compute_tiles(tile_row, first_tile_col, last_tile_col)
+                )
+
+        self.grid, self._next_grid = self._next_grid, self.grid
+        self.active_tiles = new_active_tiles
+
+    def _compute_tiles(
+        self, tile_row: int, first_tile_col: int, last_tile_col: int
+    ) -> np.ndarray:
+        nb_rows, nb_cols = self.grid.shape
+        top: int = tile_row * self.tile_size
+        bottom: int = min(top + self.tile_size, nb_rows)
+        left: int = first_tile_col * self.tile_size
+        right: int = min(last_tile_col * self.tile_size, nb_cols)
+
+        # Including a one cell halo around the tiles to count their neighbors
+        halo_top: int = max(top - 1, 0)
+        halo_left: int = max(left - 1, 0)
+        halo: np.ndarray = self.grid[
+            halo_top : min(bottom + 1, nb_rows), halo_left : min(right + 1, nb_cols)
+        ]
+        new_halo: np.ndarray = self.rules.lookup_table[
+            halo.view(np.uint8), count_neighbors(halo)
+        ]
+
+        tiles: np.ndarray = self.grid[top:bottom, left:right]
+        new_tiles: np.ndarray = new_halo[
+            top - halo_top : bottom - halo_top, left - halo_left : right - halo_left
+        ]
+        self._next_grid[top:bottom, left:right] = new_tiles
+
+        changed_cols: np.ndarray = (tiles != new_tiles).any(axis=0)
+
+        return np.logical_or.reduceat(
+            changed_cols, np.arange(0, right - left, self.tile_size)
+        )
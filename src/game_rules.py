@@ -1,193 +1,110 @@
-from itertools import product
+import re
+from functools import lru_cache
+from typing import Callable
 import numpy as np
 
+RULESTRING_PATTERN: re.Pattern = re.compile(r"^B([0-8]*)/?S([0-8]*)$", re.IGNORECASE)
 
-def _count_neighbors(grid: np.ndarray, cell_row: int, cell_col: int) -> int:
-    nb_rows, nb_cols = grid.shape
-    nb_neighbors: int = 0
 
-    for row_offset, col_offset in product((-1, 0, 1), repeat=2):
-        if row_offset == 0 and col_offset == 0:
-            continue
+def _add_neighbors(grid: np.ndarray, out: np.ndarray):
+    # Summing the 8 shifted views of the grid, cells outside the grid are dead
+    np.add(out[1:, :], grid[:-1, :], out=out[1:, :])
+    np.add(out[:-1, :], grid[1:, :], out=out[:-1, :])
+    np.add(out[:, 1:], grid[:, :-1], out=out[:, 1:])
+    np.add(out[:, :-1], grid[:, 1:], out=out[:, :-1])
+    np.add(out[1:, 1:], grid[:-1, :-1], out=out[1:, 1:])
+    np.add(out[1:, :-1], grid[:-1, 1:], out=out[1:, :-1])
+    np.add(out[:-1, 1:], grid[1:, :-1], out=out[:-1, 1:])
+    np.add(out[:-1, :-1], grid[1:, 1:], out=out[:-1, :-1])
 
-        neighbor_row, neighbor_col = cell_row + row_offset, cell_col + col_offset
 
-        if 0 <= neighbor_row < nb_rows and 0 <= neighbor_col < nb_cols:
-            nb_neighbors += grid[neighbor_row, neighbor_col]
+def count_neighbors(grid: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    if out is None:
+        out = np.zeros(grid.shape, dtype=np.uint8)
 
-    return nb_neighbors
+    else:
+        out.fill(0)
 
+    _add_neighbors(grid, out)
 
-def _get_cells_to_check(grid: np.ndarray) -> set:
-    nb_rows, nb_cols = grid.shape
-    living_cells = np.argwhere(grid)
-    neighbors_offsets = np.array(list(product((-1, 0, 1), repeat=2)))
+    return out
 
-    # Generating all neighbors for living cells
-    all_neighbors = living_cells[:, None, :] + neighbors_offsets[None, :, :]
-    all_neighbors = all_neighbors.reshape(-1, 2)
 
-    # Filtering neighbors out of the grid
-    valid_mask = (
-        (all_neighbors[:, 0] >= 0)
-        & (all_neighbors[:, 0] < nb_rows)
-        & (all_neighbors[:, 1] >= 0)
-        & (all_neighbors[:, 1] < nb_cols)
-    )
-    valid_neighbors = all_neighbors[valid_mask]
-
-    cells_to_check = set(map(tuple, valid_neighbors))
-
-    return cells_to_check
-
-
-def conway_rules(grid: np.ndarray) -> np.ndarray:
-    nb_rows, nb_cols = grid.shape
-    new_grid = np.full((nb_rows, nb_cols), False, dtype=bool)
-
-    cells_to_check = _get_cells_to_check(grid)
-
-    for cell_row, cell_col in cells_to_check:
-        nb_neighbors = _count_neighbors(grid, cell_row, cell_col)
-
-        if grid[cell_row, cell_col]:
-            new_grid[cell_row, cell_col] = nb_neighbors in [2, 3]
-        else:
-            new_grid[cell_row, cell_col] = nb_neighbors == 3
-
-    return new_grid
-
-
-def highlife_rules(grid: np.ndarray) -> np.ndarray:
-    nb_rows, nb_cols = grid.shape
-    new_grid = np.full((nb_rows, nb_cols), False, dtype=bool)
-
-    cells_to_check = _get_cells_to_check(grid)
-
-    for cell_row, cell_col in cells_to_check:
-        nb_neighbors = _count_neighbors(grid, cell_row, cell_col)
-
-        if grid[cell_row, cell_col]:
-            new_grid[cell_row, cell_col] = nb_neighbors in [2, 3]
-
-        else:
-            new_grid[cell_row, cell_col] = nb_neighbors in [3, 6]
-
-    return new_grid
-
-
-def day_and_night_rules(grid: np.ndarray) -> np.ndarray:
-    nb_rows, nb_cols = grid.shape
-    new_grid = np.full((nb_rows, nb_cols), False, dtype=bool)
-
-    cells_to_check = _get_cells_to_check(grid)
-
-    for cell_row, cell_col in cells_to_check:
-        nb_neighbors = _count_neighbors(grid, cell_row, cell_col)
-
-        if grid[cell_row, cell_col]:
-            new_grid[cell_row, cell_col] = nb_neighbors in [3, 4, 6, 7, 8]
+def parse_rulestring(rulestring: str) -> tuple[frozenset[int], frozenset[int]]:
+    match = RULESTRING_PATTERN.match(rulestring.replace(" ", ""))
 
-        else:
-            new_grid[cell_row, cell_col] = nb_neighbors in [3, 6, 7, 8]
+    if match is None:
+        raise ValueError(
+            f"Invalid rulestring '{rulestring}', expected 'B<digits>/S<digits>'"
+        )
 
-    return new_grid
+    birth: frozenset[int] = frozenset(int(digit) for digit in match.group(1))
+    survival: frozenset[int] = frozenset(int(digit) for digit in match.group(2))
 
+    return birth, survival
 
-def seeds_rules(grid: np.ndarray) -> np.ndarray:
-    nb_rows, nb_cols = grid.shape
-    new_grid = np.full((nb_rows, nb_cols), False, dtype=bool)
 
-    cells_to_check = _get_cells_to_check(grid)
-
-    for cell_row, cell_col in cells_to_check:
-        nb_neighbors = _count_neighbors(grid, cell_row, cell_col)
-
-        if grid[cell_row, cell_col]:
-            new_grid[cell_row, cell_col] = False
-
-        else:
-            new_grid[cell_row, cell_col] = nb_neighbors == 2
-
-    return new_grid
-
-
-def life_wo_death_rules(grid: np.ndarray) -> np.ndarray:
-    nb_rows, nb_cols = grid.shape
-    new_grid = np.full((nb_rows, nb_cols), False, dtype=bool)
-
-    cells_to_check = _get_cells_to_check(grid)
-
-    for cell_row, cell_col in cells_to_check:
-        nb_neighbors = _count_neighbors(grid, cell_row, cell_col)
-
-        if grid[cell_row, cell_col]:
-            new_grid[cell_row, cell_col] = nb_neighbors in [
-                0,
-                1,
-                2,
-                3,
-                4,
-                5,
-                6,
-                7,
-                8,
-            ]
-
-        else:
-            new_grid[cell_row, cell_col] = nb_neighbors == 3
-
-    return new_grid
-
-
-def diamoeba_rules(grid: np.ndarray) -> np.ndarray:
-    nb_rows, nb_cols = grid.shape
-    new_grid = np.full((nb_rows, nb_cols), False, dtype=bool)
-
-    cells_to_check = _get_cells_to_check(grid)
-
-    for cell_row, cell_col in cells_to_check:
-        nb_neighbors = _count_neighbors(grid, cell_row, cell_col)
-
-        if grid[cell_row, cell_col]:
-            new_grid[cell_row, cell_col] = nb_neighbors in [5, 6, 7, 8]
+def format_rulestring(birth: frozenset[int], survival: frozenset[int]) -> str:
+    birth_digits: str = "".join(str(nb_neighbors) for nb_neighbors in sorted(birth))
+    survival_digits: str = "".join(
+        str(nb_neighbors) for nb_neighbors in sorted(survival)
+    )
 
-        else:
-            new_grid[cell_row, cell_col] = nb_neighbors in [3, 5, 6, 7, 8]
+    return f"B{birth_digits}/S{survival_digits}"
 
-    return new_grid
 
+@lru_cache(maxsize=None)
+def _compile_rules(birth: frozenset[int], survival: frozenset[int]) -> Callable:
+    # Row 0 gives the next state of dead cells, row 1 the one of living cells
+    lookup_table: np.ndarray = np.full((2, 9), False, dtype=bool)
+    lookup_table[0, list(birth)] = True
+    lookup_table[1, list(survival)] = True
 
-def replicator_rules(grid: np.ndarray) -> np.ndarray:
-    nb_rows, nb_cols = grid.shape
-    new_grid = np.full((nb_rows, nb_cols), False, dtype=bool)
+    # Bit 9 * alive + nb_neighbors of the mask gives the next state of a cell
+    lookup_mask: np.uint32 = np.uint32(
+        sum(1 << index for index, alive in enumerate(lookup_table.ravel()) if alive)
+    )
 
-    cells_to_check = _get_cells_to_check(grid)
+    # Writing into the given out and scratch buffers, the next generation is
+    # computed without allocating any array
+    def rules(
+        grid: np.ndarray, out: np.ndarray = None, scratch: np.ndarray = None
+    ) -> np.ndarray:
+        if out is None:
+            out = np.empty(grid.shape, dtype=bool)
 
-    for cell_row, cell_col in cells_to_check:
-        nb_neighbors = _count_neighbors(grid, cell_row, cell_col)
+        if scratch is None:
+            scratch = np.empty(grid.shape, dtype=np.uint32)
 
-        new_grid[cell_row, cell_col] = nb_neighbors in [1, 3, 5, 7]
+        np.multiply(grid, np.uint32(9), out=scratch)
+        _add_neighbors(grid, scratch)
+        np.right_shift(lookup_mask, scratch, out=scratch)
+        np.bitwise_and(scratch, np.uint32(1), out=scratch)
 
-    return new_grid
+        return np.not_equal(scratch, 0, out=out)
 
+    rules.rulestring = format_rulestring(birth, survival)
+    rules.birth = birth
+    rules.survival = survival
+    rules.lookup_table = lookup_table
 
-def anneal_rules(grid: np.ndarray) -> np.ndarray:
-    nb_rows, nb_cols = grid.shape
-    new_grid = np.full((nb_rows, nb_cols), False, dtype=bool)
+    return rules
 
-    cells_to_check = _get_cells_to_check(grid)
 
-    for cell_row, cell_col in cells_to_check:
-        nb_neighbors = _count_neighbors(grid, cell_row, cell_col)
+def compile_rules(rulestring: str) -> Callable:
+    birth, survival = parse_rulestring(rulestring)
 
-        if grid[cell_row, cell_col]:
-            new_grid[cell_row, cell_col] = nb_neighbors in [3, 5, 6, 7, 8]
+    return _compile_rules(birth, survival)
 
-        else:
-            new_grid[cell_row, cell_col] = nb_neighbors in [4, 6, 7, 8]
 
-    return new_grid
+conway_rules = compile_rules("B3/S23")
+highlife_rules = compile_rules("B36/S23")
+seeds_rules = compile_rules("B2/S")
+day_and_night_rules = compile_rules("B3678/S34678")
+life_wo_death_rules = compile_rules("B3/S012345678")
+diamoeba_rules = compile_rules("B35678/S5678")
+replicator_rules = compile_rules("B1357/S1357")
+anneal_rules = compile_rules("B4678/S35678")
 
 
 GAME_RULES_REGISTRY = {
@@ -200,3 +117,10 @@ GAME_RULES_REGISTRY = {
     "Replicator (B1357/S1357)": replicator_rules,
     "Anneal (B4678/S35678)": anneal_rules,
 }
+
+
+def get_game_rules(rules: str) -> Callable:
+    if rules in GAME_RULES_REGISTRY:
+        return GAME_RULES_REGISTRY[rules]
+
+    return compile_rules(rules)
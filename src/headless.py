@@ -0,0 +1,153 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+from game_rules import GAME_RULES_REGISTRY, get_game_rules
+from engine.engine import Engine
+from engine.engines_registry import ENGINES_REGISTRY, create_engine
+from utils import load_pattern_cells, parse_positive_int, parse_non_negative_int
+
+PATTERNS_DIR: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), "patterns")
+
+
+def find_pattern_file(pattern: str) -> str:
+    if os.path.isfile(pattern):
+        return pattern
+
+    # Patterns can also be given relatively to the patterns folder, e.g.
+    # 'mathusalems/acorn', 'mathusalems/acorn.json' or 'mathusalems/acorn.rle'
+    for filename in (pattern, f"{pattern}.json", f"{pattern}.rle"):
+        pattern_file: str = os.path.join(PATTERNS_DIR, filename)
+
+        if os.path.isfile(pattern_file):
+            return pattern_file
+
+    raise FileNotFoundError(f"Pattern '{pattern}' not found")
+
+
+def create_grid(
+    pattern_cells: np.ndarray, nb_rows: int, nb_cols: int, row: int, col: int
+) -> np.ndarray:
+    pattern_rows, pattern_cols = pattern_cells.shape
+
+    if row is None:
+        row = (nb_rows - pattern_rows) // 2
+
+    if col is None:
+        col = (nb_cols - pattern_cols) // 2
+
+    if not (0 <= row <= nb_rows - pattern_rows and 0 <= col <= nb_cols - pattern_cols):
+        raise ValueError("The pattern does not fit in the grid at this position")
+
+    grid: np.ndarray = np.full((nb_rows, nb_cols), False, dtype=bool)
+    grid[row : row + pattern_rows, col : col + pattern_cols] = pattern_cells
+
+    return grid
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run a Game of Life simulation without any graphical interface."
+    )
+    parser.add_argument(
+        "pattern",
+        help="pattern JSON file, or its path in the patterns folder (e.g. mathusalems/acorn)",
+    )
+    parser.add_argument(
+        "-n",
+        "--generations",
+        type=parse_non_negative_int,
+        default=1000,
+        help="number of generations to compute (default: 1000)",
+    )
+    parser.add_argument(
+        "-r",
+        "--rules",
+        default="Conway (B3/S23)",
+        help=f"rules name or B/S rulestring, names: {', '.join(GAME_RULES_REGISTRY)}",
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        default="NumPy (dense)",
+        choices=ENGINES_REGISTRY.keys(),
+        help="engine computing the generations (default: NumPy (dense))",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=parse_positive_int,
+        help="worker processes of the parallel engine (default: all the cores)",
+    )
+    parser.add_argument(
+        "--rows", type=parse_positive_int, default=146, help="grid rows"
+    )
+    parser.add_argument(
+        "--cols", type=parse_positive_int, default=225, help="grid columns"
+    )
+    parser.add_argument(
+        "--row", type=int, help="pattern top row (default: centered vertically)"
+    )
+    parser.add_argument(
+        "--col", type=int, help="pattern left column (default: centered horizontally)"
+    )
+
+    arguments: argparse.Namespace = parser.parse_args()
+
+    try:
+        arguments.pattern_file = find_pattern_file(arguments.pattern)
+        arguments.game_rules = get_game_rules(arguments.rules)
+
+    except (FileNotFoundError, ValueError) as error:
+        parser.error(str(error))
+
+    return arguments
+
+
+def main():
+    arguments: argparse.Namespace = parse_arguments()
+
+    try:
+        pattern_name, pattern_cells = load_pattern_cells(arguments.pattern_file)
+        grid: np.ndarray = create_grid(
+            pattern_cells,
+            arguments.rows,
+            arguments.cols,
+            arguments.row,
+            arguments.col,
+        )
+        engine: Engine = create_engine(
+            arguments.engine, arguments.game_rules, arguments.workers
+        )
+
+    # Invalid pattern files, patterns not fitting in the grid and rules not supported
+    # by the engine
+    except (OSError, ValueError) as error:
+        sys.exit(f"Error: {error}")
+
+    try:
+        engine.set_grid(grid)
+
+        start_time: float = time.perf_counter()
+        engine.advance(arguments.generations)
+        population: int = engine.get_population()
+        elapsed_time: float = time.perf_counter() - start_time
+
+    finally:
+        engine.close()
+
+    print(f"Pattern: {pattern_name}")
+    print(f"Rules: {engine.rules.rulestring}")
+    print(f"Engine: {arguments.engine}")
+    print(f"Grid: {arguments.rows}x{arguments.cols}")
+    print(f"Generations: {arguments.generations}")
+    print(f"Final population: {population}")
+    print(f"Elapsed time: {elapsed_time:.3f} s")
+    print(
+        f"Generations per second: {arguments.generations / max(elapsed_time, 1e-9):.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
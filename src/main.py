@@ -1,15 +1,74 @@
+from startup_report import StartupReport
 import sys
 import os
+import argparse
+from typing import Callable
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QEvent, QTimer
+from controller.controller import Controller
 from view.main_window import MainWindow
+from utils import parse_positive_int
 
 os.environ["QT_QPA_PLATFORM_PLUGIN_PATH"] = "/usr/lib/qt/plugins"
 
 
+# Calls the callback once the first paint event of the watched widget is handled
+class FirstPaintFilter(QObject):
+    def __init__(self, callback: Callable):
+        super().__init__()
+
+        self.callback: Callable = callback
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Paint:
+            watched.removeEventFilter(self)
+            QTimer.singleShot(0, self.callback)
+
+        return False
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Game of Life")
+    parser.add_argument(
+        "--rows", type=parse_positive_int, default=Controller.NB_ROWS, help="grid rows"
+    )
+    parser.add_argument(
+        "--cols",
+        type=parse_positive_int,
+        default=Controller.NB_COLS,
+        help="grid columns",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print the duration of each startup phase",
+    )
+
+    return parser.parse_args()
+
+
 def main():
+    startup_report: StartupReport = StartupReport()
+    startup_report.mark("Imports")
+
+    arguments: argparse.Namespace = parse_arguments()
+
     app = QApplication([])
+    app.aboutToQuit.connect(Controller().close_engine)
+
+    if (arguments.rows, arguments.cols) != Controller().grid.shape:
+        Controller().resize_grid(arguments.rows, arguments.cols)
+
+    startup_report.mark("Application and grid")
 
     window = MainWindow()
+    startup_report.mark("Window construction")
+
+    if arguments.startup_report:
+        first_paint_filter: FirstPaintFilter = FirstPaintFilter(
+            lambda: (startup_report.mark("First paint"), startup_report.print())
+        )
+        window.graphics_view.viewport().installEventFilter(first_paint_filter)
 
     window.show()
     sys.exit(app.exec())
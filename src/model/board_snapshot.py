@@ -0,0 +1,124 @@
+import struct
+import zlib
+import numpy as np
+
+# Header: magic, format version, flags, number of rows, number of columns,
+# generation, length of the rulestring, then the rulestring itself
+SNAPSHOT_MAGIC: bytes = b"GOLSNAP\0"
+SNAPSHOT_VERSION: int = 1
+SNAPSHOT_HEADER: struct.Struct = struct.Struct("<8sHHQQQH")
+SNAPSHOT_COMPRESSED: int = 1
+# The payload starts on a multiple of this offset so that it can be memory-mapped
+SNAPSHOT_ALIGNMENT: int = 64
+
+
+# Whole board with its rules and generation, saved as a header followed by the
+# cells bit-packed row by row, optionally compressed. Uncompressed snapshots can be
+# memory-mapped to read some rows of huge boards without loading the whole board.
+class BoardSnapshot:
+    def __init__(
+        self, packed_cells: np.ndarray, nb_cols: int, rulestring: str, generation: int
+    ):
+        # One row of bits per row of the board, the last byte of each row padded
+        self.packed_cells: np.ndarray = packed_cells
+        self.shape: tuple[int, int] = (packed_cells.shape[0], nb_cols)
+        self.rulestring: str = rulestring
+        self.generation: int = generation
+
+    @staticmethod
+    def from_grid(
+        grid: np.ndarray, rulestring: str, generation: int
+    ) -> "BoardSnapshot":
+        return BoardSnapshot(
+            np.packbits(grid, axis=1), grid.shape[1], rulestring, generation
+        )
+
+    @property
+    def grid(self) -> np.ndarray:
+        return self.get_rows(0, self.shape[0])
+
+    def get_rows(self, first_row: int, last_row: int) -> np.ndarray:
+        # Only the given rows are read from memory-mapped snapshots
+        return np.unpackbits(
+            self.packed_cells[first_row:last_row], axis=1, count=self.shape[1]
+        ).view(bool)
+
+    def save(self, filename: str, compressed: bool = False):
+        rulestring: bytes = self.rulestring.encode("ASCII")
+        header: bytes = SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            SNAPSHOT_COMPRESSED if compressed else 0,
+            *self.shape,
+            self.generation,
+            len(rulestring),
+        )
+        header += rulestring
+        header += bytes(-len(header) % SNAPSHOT_ALIGNMENT)
+
+        packed_cells: np.ndarray = np.ascontiguousarray(self.packed_cells)
+
+        with open(filename, "wb") as file:
+            file.write(header)
+
+            if compressed:
+                file.write(zlib.compress(packed_cells, 1))
+
+            else:
+                file.write(packed_cells.data)
+
+    @staticmethod
+    def load(filename: str, memory_mapped: bool = False) -> "BoardSnapshot":
+        with open(filename, "rb") as file:
+            header: bytes = file.read(SNAPSHOT_HEADER.size)
+
+            if len(header) < SNAPSHOT_HEADER.size:
+                raise ValueError(f"Invalid snapshot file '{filename}', too short")
+
+            magic, version, flags, nb_rows, nb_cols, generation, rulestring_length = (
+                SNAPSHOT_HEADER.unpack(header)
+            )
+
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"'{filename}' is not a board snapshot file")
+
+            rulestring: str = file.read(rulestring_length).decode("ASCII")
+            offset: int = (
+                -(-(SNAPSHOT_HEADER.size + rulestring_length) // SNAPSHOT_ALIGNMENT)
+                * SNAPSHOT_ALIGNMENT
+            )
+            shape: tuple[int, int] = (nb_rows, -(-nb_cols // 8))
+
+            if flags & SNAPSHOT_COMPRESSED:
+                if memory_mapped:
+                    raise ValueError(
+                        f"Compressed snapshot file '{filename}' cannot be memory-mapped"
+                    )
+
+                file.seek(offset)
+
+                try:
+                    payload: bytes = zlib.decompress(file.read())
+
+                except zlib.error as error:
+                    raise ValueError(
+                        f"Invalid snapshot file '{filename}', {error}"
+                    ) from error
+
+                packed_cells: np.ndarray = np.frombuffer(payload, dtype=np.uint8)
+
+            elif memory_mapped:
+                packed_cells = np.memmap(
+                    filename, dtype=np.uint8, mode="r", offset=offset, shape=shape
+                )
+
+            else:
+                file.seek(offset)
+                packed_cells = np.fromfile(file, dtype=np.uint8)
+
+        if packed_cells.size != shape[0] * shape[1]:
+            raise ValueError(f"Invalid snapshot file '{filename}', truncated cells")
+
+        return BoardSnapshot(
+            packed_cells.reshape(shape), nb_cols, rulestring, generation
+        )
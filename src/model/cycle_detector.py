@@ -0,0 +1,95 @@
+from collections import deque
+import numpy as np
+from model.grid_delta import GridDelta
+
+# Cells hashed at once
+HASH_CHUNK_SIZE: int = 1 << 20
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    # Pseudo-random 64-bit key of each cell index, multiplications wrap around
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+
+    return values ^ (values >> np.uint64(31))
+
+
+def hash_indices(indices: np.ndarray) -> int:
+    # XOR of the keys of the cells of the given flat indices, by chunks to bound the
+    # memory of the keys on large grids
+    hash_value: np.uint64 = np.uint64(0)
+
+    for start in range(0, len(indices), HASH_CHUNK_SIZE):
+        hash_value ^= np.bitwise_xor.reduce(
+            _splitmix64(indices[start : start + HASH_CHUNK_SIZE].astype(np.uint64)),
+            initial=0,
+        )
+
+    return int(hash_value)
+
+
+def hash_cells(cells: np.ndarray) -> int:
+    # XOR of the keys of the living cells
+    flat_cells: np.ndarray = cells.ravel()
+    hash_value: int = 0
+
+    for start in range(0, flat_cells.size, HASH_CHUNK_SIZE):
+        hash_value ^= hash_indices(
+            np.flatnonzero(flat_cells[start : start + HASH_CHUNK_SIZE]) + start
+        )
+
+    return hash_value
+
+
+# Zobrist hashing of the generations: the hash of a grid is the XOR of the keys of
+# its living cells, so it is updated with the keys of the cells born or dead at each
+# generation. The hashes of the last generations are kept to find the first one
+# coming back, which gives the start and the period of the cycle the board entered,
+# a static board being a cycle of period 1. With 64-bit hashes, a collision between
+# different grids within the history is unlikely enough not to check the grids.
+class CycleDetector:
+    def __init__(self, history_size: int = 1024):
+        # Longest period detected
+        self.history_size: int = history_size
+
+        self.generation: int = 0
+        self.hash: int = 0
+        # First generation and period of the cycle, once detected
+        self.cycle: tuple[int, int] = None
+
+        self._nb_cols: int = 0
+        self._generations: dict[int, int] = {}
+        self._hashes: deque[int] = deque()
+
+    def reset(self, grid: np.ndarray, generation: int = 0):
+        self.generation = generation
+        self.hash = hash_cells(grid)
+        self.cycle = None
+
+        self._generations = {self.hash: generation}
+        self._hashes = deque([self.hash])
+        self._nb_cols = grid.shape[1]
+
+    def update(self, delta: GridDelta) -> tuple[int, int]:
+        # Returns the first generation and the period of the cycle when detected
+        self.generation += 1
+        self.hash ^= hash_indices(delta.rows * self._nb_cols + delta.cols)
+
+        if self.cycle is not None:
+            return None
+
+        first_generation: int = self._generations.get(self.hash)
+
+        if first_generation is not None:
+            self.cycle = (first_generation, self.generation - first_generation)
+
+            return self.cycle
+
+        self._generations[self.hash] = self.generation
+        self._hashes.append(self.hash)
+
+        if len(self._hashes) > self.history_size:
+            del self._generations[self._hashes.popleft()]
+
+        return None
@@ -0,0 +1,80 @@
+import threading
+import numpy as np
+
+
+# Minimum and maximum of some series over a whole run, in a fixed number of buckets
+# each covering the same number of generations. Once all the buckets are filled,
+# they are merged by pairs and twice as many generations go in each bucket, so the
+# memory and the time to draw the history do not depend on the length of the run.
+class DecimatedHistory:
+    def __init__(self, nb_series: int, capacity: int = 1024):
+        self.nb_series: int = nb_series
+        # Even, so that the buckets can be merged by pairs
+        self.capacity: int = capacity + capacity % 2
+
+        self.first_generation: int = 0
+        self.nb_generations: int = 0
+        self.bucket_size: int = 1
+
+        self._minimums: np.ndarray = np.empty((self.capacity, nb_series), np.int64)
+        self._maximums: np.ndarray = np.empty((self.capacity, nb_series), np.int64)
+        self._nb_buckets: int = 0
+        # Number of generations in the last bucket
+        self._last_bucket_generations: int = 0
+
+        # Appended to by the simulation thread, read by the GUI
+        self._lock: threading.Lock = threading.Lock()
+
+    def reset(self, first_generation: int = 0):
+        with self._lock:
+            self.first_generation = first_generation
+            self.nb_generations = 0
+            self.bucket_size = 1
+            self._nb_buckets = 0
+            self._last_bucket_generations = 0
+
+    def append(self, values: tuple[int, ...]):
+        with self._lock:
+            if self._last_bucket_generations == self.bucket_size:
+                self._last_bucket_generations = 0
+
+            if not self._last_bucket_generations:
+                if self._nb_buckets == self.capacity:
+                    self._merge_buckets()
+
+                self._minimums[self._nb_buckets] = values
+                self._maximums[self._nb_buckets] = values
+                self._nb_buckets += 1
+
+            else:
+                bucket: int = self._nb_buckets - 1
+                np.minimum(self._minimums[bucket], values, out=self._minimums[bucket])
+                np.maximum(self._maximums[bucket], values, out=self._maximums[bucket])
+
+            self._last_bucket_generations += 1
+            self.nb_generations += 1
+
+    def get_buckets(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # First generation, minimums and maximums of each bucket
+        with self._lock:
+            generations: np.ndarray = (
+                self.first_generation
+                + np.arange(self._nb_buckets, dtype=np.int64) * self.bucket_size
+            )
+
+            return (
+                generations,
+                self._minimums[: self._nb_buckets].copy(),
+                self._maximums[: self._nb_buckets].copy(),
+            )
+
+    def _merge_buckets(self):
+        half: int = self.capacity // 2
+        np.minimum(
+            self._minimums[0::2], self._minimums[1::2], out=self._minimums[:half]
+        )
+        np.maximum(
+            self._maximums[0::2], self._maximums[1::2], out=self._maximums[:half]
+        )
+        self._nb_buckets = half
+        self.bucket_size *= 2
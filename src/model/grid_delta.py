@@ -0,0 +1,20 @@
+import numpy as np
+
+
+class GridDelta:
+    def __init__(self, rows: np.ndarray, cols: np.ndarray, alive: np.ndarray):
+        self.rows: np.ndarray = rows
+        self.cols: np.ndarray = cols
+        self.alive: np.ndarray = alive
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @staticmethod
+    def from_grids(
+        grid: np.ndarray, new_grid: np.ndarray, changed_cells: np.ndarray = None
+    ) -> "GridDelta":
+        changed_cells = np.bitwise_xor(grid, new_grid, out=changed_cells)
+        rows, cols = np.nonzero(changed_cells)
+
+        return GridDelta(rows, cols, new_grid[rows, cols])
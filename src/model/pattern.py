@@ -1,16 +1,25 @@
 import numpy as np
-from PyQt5.QtGui import QIcon, QImage, QPixmap
 
 
 class Pattern:
-    def __init__(self, name: str, image: np.ndarray, matrix: list[list[bool]]):
+    def __init__(
+        self,
+        name: str,
+        image: np.ndarray,
+        matrix: list[list[bool]] | np.ndarray,
+        rulestring: str = None,
+    ):
         self.name: str = name
         self.image: np.ndarray = image
-        self.height: int = len(matrix)
-        self.width: int = len(matrix[0])
-        self.matrix: list[list[bool]] = matrix
+        self.matrix: np.ndarray = np.array(matrix, dtype=bool)
+        self.height, self.width = self.matrix.shape
+        # Rules the pattern is made for, as read from RLE files
+        self.rulestring: str = rulestring
+
+    def get_icon(self) -> "QIcon":
+        # Imported here so that patterns can be used without Qt (headless runs)
+        from PyQt5.QtGui import QIcon, QImage, QPixmap
 
-    def get_icon(self) -> QIcon:
         image_matrix: np.ndarray = np.array(self.image, dtype=np.uint8)
 
         image: QImage = QImage(
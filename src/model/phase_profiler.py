@@ -0,0 +1,31 @@
+from collections import deque
+import numpy as np
+
+
+# Durations of the last generations for each phase of the simulation and display,
+# recorded from both the simulation thread and the GUI thread. Appending to and
+# copying a deque are atomic, so no lock is needed.
+class PhaseProfiler:
+    def __init__(self, window: int = 240):
+        self.window: int = window
+        self._durations: dict[str, deque[float]] = {}
+
+    def record(self, phase: str, duration: float):
+        durations: deque[float] = self._durations.get(phase)
+
+        if durations is None:
+            durations = self._durations.setdefault(phase, deque(maxlen=self.window))
+
+        durations.append(duration)
+
+    def get_statistics(self) -> dict[str, tuple[float, float]]:
+        # Mean and 95th percentile of each phase, in the order they were recorded
+        statistics: dict[str, tuple[float, float]] = {}
+
+        for phase, durations in list(self._durations.items()):
+            samples: np.ndarray = np.array(durations)
+
+            if len(samples):
+                statistics[phase] = (samples.mean(), np.percentile(samples, 95))
+
+        return statistics
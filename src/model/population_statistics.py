@@ -0,0 +1,68 @@
+import numpy as np
+from model.grid_delta import GridDelta
+from model.decimated_history import DecimatedHistory
+
+
+# Population, births, deaths and bounding box of the living cells, updated from the
+# cells changed at each generation rather than by counting the whole grid again.
+# The numbers of living cells of each row and column give the bounding box.
+class PopulationStatistics:
+    def __init__(self, history_capacity: int = 1024):
+        self.generation: int = 0
+        self.population: int = 0
+        self.births: int = 0
+        self.deaths: int = 0
+        # Top row, left column, bottom row and right column, None if no cell is alive
+        self.bounding_box: tuple[int, int, int, int] = None
+
+        # Population, births and deaths of the generations of the run
+        self.history: DecimatedHistory = DecimatedHistory(3, history_capacity)
+
+        self._row_populations: np.ndarray = None
+        self._col_populations: np.ndarray = None
+
+    def reset(self, grid: np.ndarray, generation: int = 0):
+        self.generation = generation
+        self._row_populations = np.count_nonzero(grid, axis=1)
+        self._col_populations = np.count_nonzero(grid, axis=0)
+        self.population = int(self._row_populations.sum())
+        self.births = 0
+        self.deaths = 0
+        self._update_bounding_box()
+
+        self.history.reset(generation)
+        self.history.append((self.population, 0, 0))
+
+    def update(self, delta: GridDelta):
+        self.generation += 1
+
+        birth_rows: np.ndarray = delta.rows[delta.alive]
+        death_rows: np.ndarray = delta.rows[~delta.alive]
+        self.births = len(birth_rows)
+        self.deaths = len(death_rows)
+        self.population += self.births - self.deaths
+
+        if len(delta):
+            nb_rows: int = len(self._row_populations)
+            nb_cols: int = len(self._col_populations)
+            self._row_populations += np.bincount(birth_rows, minlength=nb_rows)
+            self._row_populations -= np.bincount(death_rows, minlength=nb_rows)
+            self._col_populations += np.bincount(
+                delta.cols[delta.alive], minlength=nb_cols
+            )
+            self._col_populations -= np.bincount(
+                delta.cols[~delta.alive], minlength=nb_cols
+            )
+            self._update_bounding_box()
+
+        self.history.append((self.population, self.births, self.deaths))
+
+    def _update_bounding_box(self):
+        rows: np.ndarray = np.flatnonzero(self._row_populations)
+        cols: np.ndarray = np.flatnonzero(self._col_populations)
+
+        self.bounding_box = (
+            (int(rows[0]), int(cols[0]), int(rows[-1]), int(cols[-1]))
+            if len(rows)
+            else None
+        )
@@ -0,0 +1,108 @@
+import zlib
+from collections import deque
+import numpy as np
+
+
+# History of the generations, split into segments each starting with a full keyframe
+# followed by the differences with the previous generation, all bit-packed and
+# compressed. The oldest segments are dropped beyond the memory budget.
+class Timeline:
+    def __init__(self, keyframe_interval: int = 64, memory_budget: int = 64 << 20):
+        self.keyframe_interval: int = keyframe_interval
+        self.memory_budget: int = memory_budget
+
+        self.shape: tuple[int, int] = None
+        self.first_generation: int = 0
+        self.last_generation: int = 0
+        self.memory_usage: int = 0
+
+        self._segments: deque[list[bytes]] = deque()
+        self._last_grid: np.ndarray = None
+        self._changed_cells: np.ndarray = None
+
+    def reset(self, grid: np.ndarray, generation: int = 0):
+        self.shape = grid.shape
+        self.first_generation = generation
+        self.last_generation = generation
+        self.memory_usage = 0
+
+        self._segments.clear()
+        self._last_grid = grid.copy()
+        self._changed_cells = np.empty_like(self._last_grid)
+        self._add_frame(self._compress(self._last_grid), new_segment=True)
+
+    def record(self, grid: np.ndarray, changed_cells: np.ndarray = None):
+        # The cells changed since the previous generation can be given if known
+        self.last_generation += 1
+
+        if (self.last_generation - self.first_generation) % self.keyframe_interval:
+            if changed_cells is None:
+                changed_cells = np.not_equal(
+                    grid, self._last_grid, out=self._changed_cells
+                )
+
+            self._add_frame(self._compress(changed_cells), new_segment=False)
+
+        else:
+            self._add_frame(self._compress(grid), new_segment=True)
+
+        np.copyto(self._last_grid, grid)
+
+        # Always keeping the segment being recorded
+        while self.memory_usage > self.memory_budget and len(self._segments) > 1:
+            segment: list[bytes] = self._segments.popleft()
+            self.memory_usage -= sum(len(frame) for frame in segment)
+            self.first_generation += len(segment)
+
+    def get_grid(self, generation: int) -> np.ndarray:
+        if not self.first_generation <= generation <= self.last_generation:
+            raise IndexError(
+                f"Generation {generation} is not in the timeline "
+                f"({self.first_generation} to {self.last_generation})"
+            )
+
+        # Restoring the keyframe of the segment, then applying the differences
+        segment_index, frame_index = divmod(
+            generation - self.first_generation, self.keyframe_interval
+        )
+        segment: list[bytes] = self._segments[segment_index]
+        grid: np.ndarray = self._decompress(segment[0])
+
+        for frame in segment[1 : frame_index + 1]:
+            grid ^= self._decompress(frame)
+
+        return grid
+
+    def truncate(self, generation: int):
+        # Dropping the generations after the given one, to record another future
+        self._last_grid = self.get_grid(generation)
+
+        segment_index, frame_index = divmod(
+            generation - self.first_generation, self.keyframe_interval
+        )
+
+        while len(self._segments) > segment_index + 1:
+            segment: list[bytes] = self._segments.pop()
+            self.memory_usage -= sum(len(frame) for frame in segment)
+
+        segment: list[bytes] = self._segments[segment_index]
+        self.memory_usage -= sum(len(frame) for frame in segment[frame_index + 1 :])
+        del segment[frame_index + 1 :]
+
+        self.last_generation = generation
+
+    def _add_frame(self, frame: bytes, new_segment: bool):
+        if new_segment:
+            self._segments.append([])
+
+        self._segments[-1].append(frame)
+        self.memory_usage += len(frame)
+
+    def _compress(self, grid: np.ndarray) -> bytes:
+        return zlib.compress(np.packbits(grid).tobytes(), 1)
+
+    def _decompress(self, frame: bytes) -> np.ndarray:
+        packed_grid: np.ndarray = np.frombuffer(zlib.decompress(frame), dtype=np.uint8)
+        nb_cells: int = self.shape[0] * self.shape[1]
+
+        return np.unpackbits(packed_grid, count=nb_cells).view(bool).reshape(self.shape)
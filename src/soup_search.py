@@ -0,0 +1,354 @@
+import os
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+import numpy as np
+from engine.engine import Engine
+from engine.engines_registry import ENGINES_REGISTRY, create_engine
+from game_rules import GAME_RULES_REGISTRY, get_game_rules
+from model.grid_delta import GridDelta
+from model.cycle_detector import CycleDetector
+from benchmark import REPOSITORY_DIR, parse_size, create_soup
+
+RESULTS_DIR: str = os.path.join(REPOSITORY_DIR, "soups")
+HISTOGRAM_WIDTH: int = 40
+
+
+def run_soup(
+    rules_name: str,
+    engine_name: str,
+    nb_rows: int,
+    nb_cols: int,
+    density: float,
+    seed: int,
+    max_generations: int,
+    max_period: int,
+) -> dict:
+    # Runs a soup until the grid is static or cycling, in a worker process
+    grid: np.ndarray = create_soup(nb_rows, nb_cols, density, seed)
+    population: int = int(np.count_nonzero(grid))
+    result: dict = {"seed": seed, "initial_population": population}
+
+    cycle_detector: CycleDetector = CycleDetector(max_period)
+    cycle_detector.reset(grid)
+    previous_grid: np.ndarray = grid.copy()
+    changed_cells: np.ndarray = np.empty_like(grid)
+    cycle: tuple[int, int] = None
+
+    # The soups already run in parallel, a parallel engine has a single worker
+    engine: Engine = create_engine(engine_name, get_game_rules(rules_name), 1)
+    start_time: float = time.perf_counter()
+
+    try:
+        engine.set_grid(grid)
+
+        # The population and the hash of the grid follow the changed cells
+        while cycle is None and cycle_detector.generation < max_generations:
+            engine.step()
+            grid = engine.get_grid()
+            delta: GridDelta = GridDelta.from_grids(previous_grid, grid, changed_cells)
+            np.copyto(previous_grid, grid)
+            population += 2 * int(np.count_nonzero(delta.alive)) - len(delta)
+            cycle = cycle_detector.update(delta)
+
+    finally:
+        engine.close()
+
+    result.update(
+        {
+            "stabilised": cycle is not None,
+            # Generation from which the grid is static or cycling
+            "lifespan": cycle[0] if cycle is not None else None,
+            "period": cycle[1] if cycle is not None else None,
+            "generations": cycle_detector.generation,
+            "final_population": population,
+            "elapsed_time": time.perf_counter() - start_time,
+        }
+    )
+
+    return result
+
+
+def load_results(output: str, parameters: dict) -> list[dict]:
+    # Soups already run by a previous search with the same parameters
+    if not os.path.isfile(output):
+        return []
+
+    results: list[dict] = []
+    valid_size: int = 0
+
+    with open(output, "rb") as file:
+        for line in file:
+            # A search interrupted while writing leaves an incomplete last line
+            if not line.endswith(b"\n"):
+                break
+
+            try:
+                result: dict = json.loads(line)
+
+            except ValueError:
+                break
+
+            if any(result.get(name) != parameters[name] for name in parameters):
+                raise ValueError(
+                    f"'{output}' contains soups searched with other parameters"
+                )
+
+            results.append(result)
+            valid_size += len(line)
+
+    # The incomplete line is removed, to be run again
+    if valid_size != os.path.getsize(output):
+        with open(output, "r+b") as file:
+            file.truncate(valid_size)
+
+    return results
+
+
+def get_log2_bin(value: int) -> int:
+    # Upper bound of the power of two bin of a value: 0, 1, 2, 4, 8...
+    return 1 << (value - 1).bit_length() if value > 0 else 0
+
+
+def format_histogram(title: str, counter: Counter, log2_bins: bool) -> list[str]:
+    lines: list[str] = [title]
+
+    if not counter:
+        return lines + ["  none"]
+
+    max_count: int = max(counter.values())
+
+    for value in sorted(counter):
+        label: str = str(value)
+
+        if log2_bins and value > 2:
+            label = f"{value // 2 + 1}-{value}"
+
+        bar: str = "#" * max(1, round(counter[value] / max_count * HISTOGRAM_WIDTH))
+        lines.append(f"  {label:>15} {counter[value]:>8,} {bar}")
+
+    return lines
+
+
+def format_summary(results: list[dict]) -> str:
+    stabilised: list[dict] = [result for result in results if result["stabilised"]]
+    lines: list[str] = [
+        f"Soups: {len(results):,}, stabilised: {len(stabilised):,}, "
+        f"still running at the maximum generation: "
+        f"{len(results) - len(stabilised):,}"
+    ]
+
+    if stabilised:
+        lifespans: np.ndarray = np.array([result["lifespan"] for result in stabilised])
+        longest: dict = max(stabilised, key=lambda result: result["lifespan"])
+        lines.append(
+            f"Lifespan: mean {lifespans.mean():,.1f}, median "
+            f"{np.median(lifespans):,.0f}, longest {longest['lifespan']:,} "
+            f"(seed {longest['seed']})"
+        )
+
+    lines.append("")
+    lines += format_histogram(
+        "Lifespan (generations)",
+        Counter(get_log2_bin(result["lifespan"]) for result in stabilised),
+        log2_bins=True,
+    )
+    lines.append("")
+    lines += format_histogram(
+        "Period", Counter(result["period"] for result in stabilised), log2_bins=False
+    )
+    lines.append("")
+    lines += format_histogram(
+        "Final population",
+        Counter(get_log2_bin(result["final_population"]) for result in stabilised),
+        log2_bins=True,
+    )
+
+    return "\n".join(lines)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run seeded random soups until they are static or cycling, in "
+        "parallel, and print the histograms of their lifespans, periods and final "
+        "populations. The soups are saved to a JSON lines file as they finish, and "
+        "running the search again skips the seeds already in the file."
+    )
+    parser.add_argument(
+        "-r",
+        "--rules",
+        default="Conway (B3/S23)",
+        help=f"rules name or B/S rulestring, names: {', '.join(GAME_RULES_REGISTRY)}",
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        default="NumPy (dense)",
+        choices=ENGINES_REGISTRY.keys(),
+        help="engine computing the generations (default: NumPy (dense))",
+    )
+    parser.add_argument(
+        "-s",
+        "--size",
+        type=parse_size,
+        default=(64, 64),
+        help="grid size as <rows>x<cols>, cells outside the grid being dead "
+        "(default: 64x64)",
+    )
+    parser.add_argument(
+        "-d",
+        "--density",
+        type=float,
+        default=0.5,
+        help="density of living cells of the soups (default: 0.5)",
+    )
+    parser.add_argument(
+        "-n",
+        "--soups",
+        type=int,
+        default=1000,
+        help="number of soups, with consecutive seeds (default: 1000)",
+    )
+    parser.add_argument(
+        "--first-seed", type=int, default=0, help="seed of the first soup (default: 0)"
+    )
+    parser.add_argument(
+        "--max-generations",
+        type=int,
+        default=100000,
+        help="generations after which a soup is given up (default: 100000)",
+    )
+    parser.add_argument(
+        "--max-period",
+        type=int,
+        default=1024,
+        help="longest period detected, the soups cycling with longer periods "
+        "running until the maximum generation (default: 1024)",
+    )
+    parser.add_argument(
+        "-j",
+        "--processes",
+        type=int,
+        default=os.cpu_count(),
+        help=f"worker processes (default: {os.cpu_count()})",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="JSON lines results file (default: "
+        "soups/<rulestring>_<rows>x<cols>_<density>.jsonl)",
+    )
+
+    arguments: argparse.Namespace = parser.parse_args()
+
+    # Rules not supported by the engine are reported before running any soup
+    try:
+        rules = get_game_rules(arguments.rules)
+        create_engine(arguments.engine, rules, 1).close()
+        arguments.rulestring = rules.rulestring
+
+    except ValueError as error:
+        parser.error(str(error))
+
+    return arguments
+
+
+def main():
+    arguments: argparse.Namespace = parse_arguments()
+    nb_rows, nb_cols = arguments.size
+    parameters: dict = {
+        "rulestring": arguments.rulestring,
+        "engine": arguments.engine,
+        "rows": nb_rows,
+        "cols": nb_cols,
+        "density": arguments.density,
+        "max_generations": arguments.max_generations,
+        "max_period": arguments.max_period,
+    }
+
+    output: str = arguments.output
+
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(
+            RESULTS_DIR,
+            f"{arguments.rulestring.replace('/', '')}_{nb_rows}x{nb_cols}_"
+            f"{arguments.density:g}.jsonl",
+        )
+
+    try:
+        results: list[dict] = load_results(output, parameters)
+
+    except ValueError as error:
+        sys.exit(f"{error}, choose another output file")
+
+    done_seeds: set[int] = {result["seed"] for result in results}
+    seeds: list[int] = [
+        seed
+        for seed in range(arguments.first_seed, arguments.first_seed + arguments.soups)
+        if seed not in done_seeds
+    ]
+
+    print(
+        f"{len(seeds):,} soups to run, {arguments.soups - len(seeds):,} already in "
+        f"{output}",
+        flush=True,
+    )
+
+    start_time: float = time.perf_counter()
+
+    with open(output, "a", encoding="UTF-8") as file:
+        executor: ProcessPoolExecutor = ProcessPoolExecutor(arguments.processes)
+
+        try:
+            futures: list[Future] = [
+                executor.submit(
+                    run_soup,
+                    arguments.rules,
+                    arguments.engine,
+                    nb_rows,
+                    nb_cols,
+                    arguments.density,
+                    seed,
+                    arguments.max_generations,
+                    arguments.max_period,
+                )
+                for seed in seeds
+            ]
+
+            # Each soup is written as soon as it finishes, to resume from there
+            for nb_finished, future in enumerate(as_completed(futures), 1):
+                result: dict = {**parameters, **future.result()}
+                file.write(json.dumps(result) + "\n")
+                file.flush()
+                results.append(result)
+
+                if nb_finished % 100 == 0 or nb_finished == len(seeds):
+                    elapsed_time: float = time.perf_counter() - start_time
+                    print(
+                        f"{nb_finished:,}/{len(seeds):,} soups in "
+                        f"{elapsed_time:,.1f} s",
+                        flush=True,
+                    )
+
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            sys.exit(f"Interrupted, run the search again to resume it from {output}")
+
+        executor.shutdown()
+
+    # Soups of the seeds asked for, including the ones of previous searches
+    seed_range: range = range(
+        arguments.first_seed, arguments.first_seed + arguments.soups
+    )
+    print()
+    print(
+        format_summary([result for result in results if result["seed"] in seed_range])
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import time
+
+# Imported first by main.py, so that this is about when the imports start
+START_TIME: float = time.perf_counter()
+
+
+# Durations of the startup phases, from the imports to the first paint of the window
+class StartupReport:
+    def __init__(self):
+        self.phases: list[tuple[str, float]] = []
+        self._last_time: float = START_TIME
+
+    def mark(self, phase: str):
+        current_time: float = time.perf_counter()
+        self.phases.append((phase, current_time - self._last_time))
+        self._last_time = current_time
+
+    def print(self):
+        print("Startup report:")
+
+        for phase, duration in self.phases:
+            print(f"- {phase}: {duration * 1000:.1f} ms")
+
+        print(f"- Total: {(self._last_time - START_TIME) * 1000:.1f} ms", flush=True)
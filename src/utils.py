@@ -1,6 +1,9 @@
 import os
+import re
+import argparse
 import json
-import cv2
+import hashlib
+from typing import Iterator
 import numpy as np
 from model.pattern import Pattern
 
@@ -8,80 +11,323 @@ BLACK = 0
 WHITE = 255
 GRAY = 128
 CELL_SIZE = 20
+MIN_GRID_CELL_SIZE = 4
+THUMBNAIL_MAX_SIZE = 200
+THUMBNAILS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), ".cache", "thumbnails"
+)
 
+RLE_EXTENSION = ".rle"
+RLE_CHUNK_SIZE = 1 << 16
+RLE_LINE_LENGTH = 70
+RLE_HEADER_FIELD_PATTERN = re.compile(r"(\w+)\s*=\s*([^,\s]+)")
 
-def from_pattern_matrix_to_image(pattern: list[list[bool]]) -> np.ndarray:
-    nb_rows: int = len(pattern)
-    nb_cols: int = len(pattern[0])
-    height: int = nb_rows * CELL_SIZE
-    width: int = nb_cols * CELL_SIZE
 
-    image: np.ndarray = np.full((height, width, 1), WHITE, dtype=np.uint8)
+def from_pattern_matrix_to_image(
+    pattern: list[list[bool]], cell_size: int = CELL_SIZE
+) -> np.ndarray:
+    cells: np.ndarray = np.array(pattern, dtype=bool)
 
-    for y in range(nb_rows):
-        for x in range(nb_cols):
-            top_left: int = (x * CELL_SIZE, y * CELL_SIZE)
-            bottom_right: int = ((x + 1) * CELL_SIZE, (y + 1) * CELL_SIZE)
-            color: int = GRAY if pattern[y][x] else WHITE
+    # Each cell becomes a square of pixels, the first row and column of each square
+    # being the grid lines
+    image: np.ndarray = np.where(cells, np.uint8(GRAY), np.uint8(WHITE))
+    image = image.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
 
-            cv2.rectangle(image, top_left, bottom_right, color, thickness=-1)
+    if cell_size >= MIN_GRID_CELL_SIZE:
+        image[::cell_size, :] = BLACK
+        image[:, ::cell_size] = BLACK
 
-    for y in range(nb_rows + 1):
-        y_coord: int = y * CELL_SIZE
+    return image[:, :, np.newaxis]
 
-        cv2.line(image, (0, y_coord), (width, y_coord), BLACK, 1)
 
-    for x in range(nb_cols + 1):
-        x_coord: int = x * CELL_SIZE
+def get_pattern_thumbnail(pattern: list[list[bool]]) -> np.ndarray:
+    cells: np.ndarray = np.array(pattern, dtype=bool)
 
-        cv2.line(image, (x_coord, 0), (x_coord, height), BLACK, 1)
+    # Large patterns are drawn with smaller cells so that thumbnails stay small
+    cell_size: int = max(1, min(CELL_SIZE, THUMBNAIL_MAX_SIZE // max(cells.shape)))
 
-    return image
+    # Thumbnails are cached by their content, so renamed or moved patterns keep them
+    key: str = hashlib.sha1(
+        f"{cells.shape}/{cell_size}".encode() + np.packbits(cells).tobytes()
+    ).hexdigest()
+    thumbnail_file: str = os.path.join(THUMBNAILS_DIR, f"{key}.npy")
 
+    try:
+        return np.load(thumbnail_file)
 
-def save_pattern_to_file(pattern: Pattern):
+    except (OSError, ValueError):
+        pass
+
+    thumbnail: np.ndarray = from_pattern_matrix_to_image(pattern, cell_size)
+
+    try:
+        os.makedirs(THUMBNAILS_DIR, exist_ok=True)
+        np.save(thumbnail_file, thumbnail)
+
+    # The cache is optional, e.g. in a read-only installation
+    except OSError:
+        pass
+
+    return thumbnail
+
+
+def save_pattern_to_file(pattern: Pattern, filename: str = None):
     name: str = pattern.name.lower().replace(" ", "_")
-    width: int = len(pattern.matrix[0])
-    height: int = len(pattern.matrix)
-    cells = pattern.matrix
+
+    if filename is None:
+        custom_patterns_dir = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "patterns", "customs"
+        )
+        filename = os.path.join(custom_patterns_dir, f"{name}.json")
+
+    # TODO: Manage already existing files not to overwrite them
+
+    if filename.lower().endswith(RLE_EXTENSION):
+        save_rle_file(filename, pattern.name, pattern.matrix, pattern.rulestring)
+        return
 
     pattern_data = {
         "name": name,
         "pattern": {
-            "width": width,
-            "height": height,
-            "cells": cells,
+            "width": pattern.width,
+            "height": pattern.height,
+            "cells": pattern.matrix.tolist(),
         },
     }
 
     json_data = json.dumps(pattern_data, indent=4)
-    filename: str = f"{name}.json"
 
-    custom_patterns_dir = os.path.join(
-        os.path.dirname(os.path.dirname(__file__)), "patterns", "customs"
+    with open(filename, "w", encoding="UTF-8") as file:
+        file.write(json_data)
+
+
+def save_rle_file(filename: str, name: str, cells: np.ndarray, rulestring: str):
+    nb_rows, nb_cols = cells.shape
+
+    with open(filename, "w", encoding="UTF-8") as file:
+        file.write(f"#N {name}\n")
+        file.write(f"x = {nb_cols}, y = {nb_rows}, rule = {rulestring or 'B3/S23'}\n")
+
+        line: str = ""
+
+        for token in _encode_rle_tokens(cells):
+            if len(line) + len(token) > RLE_LINE_LENGTH:
+                file.write(f"{line}\n")
+                line = ""
+
+            line += token
+
+        file.write(f"{line}!\n")
+
+
+def _encode_rle_tokens(cells: np.ndarray) -> Iterator[str]:
+    nb_empty_rows: int = 0
+
+    for row_index, row in enumerate(cells):
+        # Bounds of the runs of living cells of the row
+        bounds: np.ndarray = np.flatnonzero(
+            np.diff(np.concatenate(([0], row.view(np.int8), [0])))
+        ).reshape(-1, 2)
+
+        if not len(bounds):
+            nb_empty_rows += 1
+            continue
+
+        # Empty rows are skipped by the end of line of the previous ones
+        if row_index > nb_empty_rows:
+            nb_empty_rows += 1
+
+        if nb_empty_rows:
+            yield f"{nb_empty_rows if nb_empty_rows > 1 else ''}$"
+            nb_empty_rows = 0
+
+        end: int = 0
+
+        for start, stop in bounds:
+            if start > end:
+                yield f"{start - end if start - end > 1 else ''}b"
+
+            yield f"{stop - start if stop - start > 1 else ''}o"
+            end = stop
+
+
+def load_rle_cells(filename: str) -> tuple[str, np.ndarray, str]:
+    name: str = os.path.splitext(os.path.basename(filename))[0]
+
+    with open(filename, "rb") as file:
+        # Comment lines, among which the name, come before the size line
+        line: bytes = b""
+
+        for line in file:
+            line = line.strip()
+
+            if line.startswith(b"#N"):
+                name = line[2:].strip().decode("UTF-8")
+
+            elif line and not line.startswith(b"#"):
+                break
+
+        header: dict[str, str] = dict(
+            RLE_HEADER_FIELD_PATTERN.findall(line.decode("UTF-8"))
+        )
+
+        if "x" not in header or "y" not in header:
+            raise ValueError(f"Invalid RLE file '{filename}', missing its size line")
+
+        cells: np.ndarray = np.zeros((int(header["y"]), int(header["x"])), dtype=bool)
+        row: int = 0
+        col: int = 0
+        pending: bytes = b""
+        ended: bool = False
+
+        # Decoding the runs by chunks, a run split between two chunks is decoded with
+        # the next one
+        while not ended:
+            chunk: bytes = file.read(RLE_CHUNK_SIZE)
+            data: bytes = pending + chunk.translate(None, b" \t\r\n")
+
+            if chunk:
+                last_tag: int = len(data.rstrip(b"0123456789"))
+                data, pending = data[:last_tag], data[last_tag:]
+
+            row, col, ended = _decode_rle_runs(data, cells, row, col)
+            ended = ended or not chunk
+
+    return name, cells, header.get("rule")
+
+
+def _decode_rle_runs(
+    data: bytes, cells: np.ndarray, row: int, col: int
+) -> tuple[int, int, bool]:
+    codes: np.ndarray = np.frombuffer(data, dtype=np.uint8)
+
+    # Each run is an optional count followed by a tag, 'b' for dead cells, '$' for
+    # the end of a line, '!' for the end of the pattern and any other for alive cells
+    is_digit: np.ndarray = (codes >= ord("0")) & (codes <= ord("9"))
+    tag_positions: np.ndarray = np.flatnonzero(~is_digit)
+    tags: np.ndarray = codes[tag_positions]
+
+    end_positions: np.ndarray = np.flatnonzero(tags == ord("!"))
+    ended: bool = bool(len(end_positions))
+
+    if ended:
+        tags = tags[: end_positions[0]]
+        tag_positions = tag_positions[: end_positions[0]]
+
+    nb_runs: int = len(tags)
+
+    if not nb_runs:
+        return row, col, ended
+
+    # Counts are the numbers written by the digits before their tag
+    digit_positions: np.ndarray = np.flatnonzero(is_digit)
+    digit_positions = digit_positions[digit_positions < tag_positions[-1]]
+    digit_runs: np.ndarray = np.searchsorted(tag_positions, digit_positions)
+    digit_values: np.ndarray = (codes[digit_positions] - ord("0")) * 10.0 ** (
+        tag_positions[digit_runs] - 1 - digit_positions
     )
+    counts: np.ndarray = np.where(
+        np.bincount(digit_runs, minlength=nb_runs) > 0,
+        np.bincount(digit_runs, weights=digit_values, minlength=nb_runs),
+        1,
+    ).astype(np.int64)
 
-    # TODO: Manage already existing files not to overwrite them
+    new_lines: np.ndarray = tags == ord("$")
+    alive: np.ndarray = ~new_lines & (tags != ord("b")) & (tags != ord("."))
+    line_counts: np.ndarray = np.where(new_lines, counts, 0)
+    col_counts: np.ndarray = np.where(new_lines, 0, counts)
 
-    with open(
-        os.path.join(custom_patterns_dir, filename), "w", encoding="UTF-8"
-    ) as file:
-        file.write(json_data)
+    # Row and column of each run, columns restarting after each end of line
+    rows: np.ndarray = row + np.cumsum(line_counts) - line_counts
+    col_totals: np.ndarray = np.cumsum(col_counts) - col_counts
+    last_new_lines: np.ndarray = np.maximum.accumulate(
+        np.where(new_lines, np.arange(nb_runs), -1)
+    )
+    cols: np.ndarray = np.where(
+        last_new_lines >= 0, col_totals - col_totals[last_new_lines], col + col_totals
+    )
 
+    alive_rows: np.ndarray = rows[alive]
+    alive_cols: np.ndarray = cols[alive]
+    alive_counts: np.ndarray = counts[alive]
+
+    nb_rows, nb_cols = cells.shape
+
+    if len(alive_rows) and (
+        alive_rows.max() >= nb_rows or (alive_cols + alive_counts).max() > nb_cols
+    ):
+        raise ValueError("Invalid RLE file, cells beyond the pattern size")
+
+    # Index of every living cell, each run being a range of consecutive cells
+    starts: np.ndarray = alive_rows * nb_cols + alive_cols
+    offsets: np.ndarray = np.cumsum(alive_counts) - alive_counts
+    cells.ravel()[
+        np.repeat(starts - offsets, alive_counts) + np.arange(alive_counts.sum())
+    ] = True
+
+    end_col: int = int(col_totals[-1] + col_counts[-1])
+
+    if last_new_lines[-1] >= 0:
+        end_col -= int(col_totals[last_new_lines[-1]])
+
+    else:
+        end_col += col
+
+    return int(rows[-1] + line_counts[-1]), end_col, ended
+
+
+def load_pattern_cells(filename: str) -> tuple[str, np.ndarray]:
+    if filename.lower().endswith(RLE_EXTENSION):
+        pattern_name, pattern_cells, _ = load_rle_cells(filename)
+
+        return pattern_name, pattern_cells
 
-def load_pattern_from_file(filename: str) -> Pattern:
     with open(filename, encoding="UTF-8") as file:
         pattern_data = json.load(file)
 
-    pattern_name: str = pattern_data["name"]
-    pattern_cells: list[list[bool]] = pattern_data["pattern"]["cells"]
+    return pattern_data["name"], np.array(pattern_data["pattern"]["cells"], dtype=bool)
+
+
+def load_pattern_from_file(filename: str) -> Pattern:
+    rulestring: str = None
+
+    if filename.lower().endswith(RLE_EXTENSION):
+        pattern_name, pattern_cells, rulestring = load_rle_cells(filename)
+
+    else:
+        pattern_name, pattern_cells = load_pattern_cells(filename)
 
-    pattern_image: np.ndarray = from_pattern_matrix_to_image(pattern_cells)
+    pattern_image: np.ndarray = get_pattern_thumbnail(pattern_cells)
 
     pattern: Pattern = Pattern(
         name=pattern_name,
         image=pattern_image,
         matrix=pattern_cells,
+        rulestring=rulestring,
     )
 
     return pattern
+
+
+def parse_positive_int(value: str) -> int:
+    # Argument type of the command line options counting rows, columns or workers
+    return _parse_bounded_int(value, 1)
+
+
+def parse_non_negative_int(value: str) -> int:
+    return _parse_bounded_int(value, 0)
+
+
+def _parse_bounded_int(value: str, minimum: int) -> int:
+    try:
+        number: int = int(value)
+
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid integer '{value}'")
+
+    if number < minimum:
+        raise argparse.ArgumentTypeError(
+            f"Invalid value '{value}', expected at least {minimum}"
+        )
+
+    return number
@@ -15,7 +15,7 @@ from view.add_pattern_graphics_scene import AddPatternGraphicsScene
 from view.add_pattern_graphics_view import AddPatternGraphicsview
 from view.cell import Cell
 from model.pattern import Pattern
-from utils import from_pattern_matrix_to_image
+from utils import get_pattern_thumbnail
 
 
 class AddCustomPatternDialog(QDialog):
@@ -150,7 +150,7 @@ class AddCustomPatternDialog(QDialog):
 
                 matrix[row].append(item.is_alive())
 
-        image: np.ndarray = from_pattern_matrix_to_image(matrix)
+        image: np.ndarray = get_pattern_thumbnail(matrix)
 
         pattern: Pattern = Pattern(
             name=self.pattern_name_line_edit.text(),
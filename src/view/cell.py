@@ -21,6 +21,3 @@ class Cell(QGraphicsRectItem):
 
     def is_alive(self) -> bool:
         return self.brush().color() == Qt.black
-
-    def set_alive_preview(self):
-        self.setBrush(QBrush(Qt.darkGray) if self.is_alive() else QBrush(Qt.lightGray))
@@ -1,3 +1,4 @@
+import numpy as np
 from PyQt5.QtWidgets import (
     QComboBox,
     QVBoxLayout,
@@ -7,12 +8,26 @@ from PyQt5.QtWidgets import (
     QSlider,
     QLineEdit,
     QFrame,
+    QSpinBox,
+    QFileDialog,
+    QCheckBox,
+    QMessageBox,
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QCursor, QIntValidator
 from controller.controller import Controller
 from view.patterns_tab_widget import PatternsTabWidget
-from game_rules import GAME_RULES_REGISTRY
+from view.population_chart import PopulationChart
+from game_rules import GAME_RULES_REGISTRY, get_game_rules
+from engine.engines_registry import ENGINES_REGISTRY
+from engine.parallel_engine import ParallelEngine
+
+# Generations per second of each position of the speed slider, 0 for no limit
+GAME_SPEEDS: list[int] = [1, 2, 5, 10, 30, 60, 200, 1000, 5000, 0]
+MAX_GRID_SIZE: int = 20000
+# Estimated memory above which resizing the grid asks for confirmation
+MEMORY_WARNING_THRESHOLD: int = 2 << 30
+BOARD_FILE_FILTERS: str = "Board snapshot (*.gol);;Compressed board snapshot (*.golz)"
 
 
 class ControlLayout(QVBoxLayout):
@@ -21,14 +36,16 @@ class ControlLayout(QVBoxLayout):
 
         self.controller: Controller = Controller()
         self.controller.pause_simulation_signal.connect(self.pause_simulation)
+        self.controller.timeline_changed_signal.connect(self.update_timeline)
+        self.controller.resize_grid_signal.connect(self.update_grid_size)
 
         self.create_ui()
 
     def create_ui(self):
-        self.setContentsMargins(20, 30, 20, 50)
+        self.setContentsMargins(20, 20, 20, 50)
 
         main_layout = QVBoxLayout()
-        main_layout.setSpacing(40)
+        main_layout.setSpacing(30)
         self.addLayout(main_layout)
 
         game_label = QLabel("Game of Life")
@@ -37,7 +54,7 @@ class ControlLayout(QVBoxLayout):
         main_layout.addWidget(game_label)
 
         sub_layout = QVBoxLayout()
-        sub_layout.setSpacing(20)
+        sub_layout.setSpacing(15)
         main_layout.addLayout(sub_layout)
 
         rules_layout = QVBoxLayout()
@@ -72,23 +89,62 @@ class ControlLayout(QVBoxLayout):
         rules_sub_layout.addWidget(game_rules_help_btn)
 
         self.rules_combo_box = QComboBox()
-        self.rules_combo_box.setToolTip("Select rules for the simulation")
+        self.rules_combo_box.setToolTip(
+            "Select rules for the simulation or enter a rulestring (e.g. B36/S23)"
+        )
         self.rules_combo_box.setCursor(QCursor(Qt.PointingHandCursor))
+        self.rules_combo_box.setEditable(True)
+        self.rules_combo_box.setInsertPolicy(QComboBox.NoInsert)
+        self.rules_combo_box.lineEdit().setPlaceholderText("B3/S23")
         for rule_name in GAME_RULES_REGISTRY.keys():
             self.rules_combo_box.addItem(rule_name)
         rules_layout.addWidget(self.rules_combo_box)
 
+        engine_layout = QVBoxLayout()
+        engine_layout.setSpacing(5)
+        sub_layout.addLayout(engine_layout)
+
+        engine_header_layout = QHBoxLayout()
+        engine_layout.addLayout(engine_header_layout)
+
+        engine_label = QLabel("Select engine")
+        engine_header_layout.addWidget(engine_label)
+
+        engine_header_layout.addStretch()
+
+        self.workers_spin_box = QSpinBox()
+        self.workers_spin_box.setRange(1, 256)
+        self.workers_spin_box.setValue(self.controller.nb_workers)
+        self.workers_spin_box.setSuffix(" workers")
+        self.workers_spin_box.setToolTip(
+            "Set number of worker processes of the parallel engine"
+        )
+        self.workers_spin_box.valueChanged.connect(self.controller.set_nb_workers)
+        engine_header_layout.addWidget(self.workers_spin_box)
+
+        self.engine_combo_box = QComboBox()
+        self.engine_combo_box.setToolTip("Select the engine computing the generations")
+        self.engine_combo_box.setCursor(QCursor(Qt.PointingHandCursor))
+        for engine_name in ENGINES_REGISTRY.keys():
+            self.engine_combo_box.addItem(engine_name)
+        self.engine_combo_box.currentTextChanged.connect(self.update_memory_label)
+        self.engine_combo_box.currentTextChanged.connect(self.update_workers_spin_box)
+        engine_layout.addWidget(self.engine_combo_box)
+        self.update_workers_spin_box()
+
         game_speed_layout = QVBoxLayout()
         game_speed_layout.setSpacing(5)
         sub_layout.addLayout(game_speed_layout)
 
-        game_speed_label = QLabel("Game Speed")
-        game_speed_layout.addWidget(game_speed_label)
+        self.game_speed_label = QLabel()
+        game_speed_layout.addWidget(self.game_speed_label)
 
         self.game_speed_slider = QSlider(Qt.Horizontal)
-        self.game_speed_slider.setToolTip("Set game speed")
-        self.game_speed_slider.setRange(1, 10)
-        self.game_speed_slider.setValue(1)
+        self.game_speed_slider.setToolTip("Set game speed in generations per second")
+        self.game_speed_slider.setRange(0, len(GAME_SPEEDS) - 1)
+        self.game_speed_slider.setValue(0)
+        self.game_speed_slider.valueChanged.connect(self.update_game_speed_label)
+        self.update_game_speed_label(0)
         self.game_speed_slider.setPageStep(1)
         self.game_speed_slider.setTickPosition(QSlider.TicksBelow)
         self.game_speed_slider.setCursor(QCursor(Qt.PointingHandCursor))
@@ -171,9 +227,60 @@ class ControlLayout(QVBoxLayout):
         separator.setFrameShadow(QFrame.Sunken)
         sub_layout.addWidget(separator)
 
+        grid_size_layout = QVBoxLayout()
+        grid_size_layout.setSpacing(5)
+        sub_layout.addLayout(grid_size_layout)
+
+        grid_size_header_layout = QHBoxLayout()
+        grid_size_layout.addLayout(grid_size_header_layout)
+
+        grid_size_label = QLabel("Grid size")
+        grid_size_header_layout.addWidget(grid_size_label)
+
+        grid_size_header_layout.addStretch()
+
+        grid_size_sub_layout = QHBoxLayout()
+        grid_size_sub_layout.setSpacing(5)
+        grid_size_layout.addLayout(grid_size_sub_layout)
+
+        nb_rows, nb_cols = self.controller.grid.shape
+
+        self.rows_spin_box = QSpinBox()
+        self.rows_spin_box.setRange(1, MAX_GRID_SIZE)
+        self.rows_spin_box.setValue(nb_rows)
+        self.rows_spin_box.setToolTip("Set number of rows")
+        self.rows_spin_box.valueChanged.connect(self.update_memory_label)
+        grid_size_sub_layout.addWidget(self.rows_spin_box)
+
+        self.cols_spin_box = QSpinBox()
+        self.cols_spin_box.setRange(1, MAX_GRID_SIZE)
+        self.cols_spin_box.setValue(nb_cols)
+        self.cols_spin_box.setToolTip("Set number of columns")
+        self.cols_spin_box.valueChanged.connect(self.update_memory_label)
+        grid_size_sub_layout.addWidget(self.cols_spin_box)
+
+        self.resize_btn = QPushButton("Resize")
+        self.resize_btn.setToolTip("Resize grid, keeping its top left cells")
+        self.resize_btn.clicked.connect(self.resize_grid)
+        self.resize_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        grid_size_sub_layout.addWidget(self.resize_btn)
+
+        self.memory_label = QLabel()
+        self.memory_label.setToolTip(
+            "Estimated memory used by the simulation with the selected engine, "
+            f"including up to {self.controller.TIMELINE_MEMORY_BUDGET >> 20} MiB "
+            "of timeline"
+        )
+        grid_size_header_layout.addWidget(self.memory_label)
+        self.update_memory_label()
+
+        board_layout = QVBoxLayout()
+        board_layout.setSpacing(10)
+        sub_layout.addLayout(board_layout)
+
         grid_layout = QHBoxLayout()
         grid_layout.setSpacing(10)
-        sub_layout.addLayout(grid_layout)
+        board_layout.addLayout(grid_layout)
 
         self.show_hide_grid_btn = QPushButton("Show/hide grid")
         self.show_hide_grid_btn.setToolTip("Show/hide grid")
@@ -187,9 +294,31 @@ class ControlLayout(QVBoxLayout):
         self.clear_btn.setCursor(QCursor(Qt.PointingHandCursor))
         grid_layout.addWidget(self.clear_btn)
 
+        board_file_layout = QHBoxLayout()
+        board_file_layout.setSpacing(10)
+        board_layout.addLayout(board_file_layout)
+
+        self.save_board_btn = QPushButton("Save board")
+        self.save_board_btn.setToolTip(
+            "Save the whole board with its rules and generation"
+        )
+        self.save_board_btn.clicked.connect(self.save_board)
+        self.save_board_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        board_file_layout.addWidget(self.save_board_btn)
+
+        self.load_board_btn = QPushButton("Load board")
+        self.load_board_btn.setToolTip("Load a saved board")
+        self.load_board_btn.clicked.connect(self.load_board)
+        self.load_board_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        board_file_layout.addWidget(self.load_board_btn)
+
+        simulation_layout = QVBoxLayout()
+        simulation_layout.setSpacing(10)
+        sub_layout.addLayout(simulation_layout)
+
         start_pause_layout = QHBoxLayout()
         start_pause_layout.setSpacing(10)
-        sub_layout.addLayout(start_pause_layout)
+        simulation_layout.addLayout(start_pause_layout)
 
         self.pause_btn = QPushButton("Pause")
         self.pause_btn.setToolTip("Pause simulation")
@@ -204,6 +333,50 @@ class ControlLayout(QVBoxLayout):
         self.start_btn.setCursor(QCursor(Qt.PointingHandCursor))
         start_pause_layout.addWidget(self.start_btn)
 
+        jump_layout = QHBoxLayout()
+        jump_layout.setSpacing(10)
+        simulation_layout.addLayout(jump_layout)
+
+        self.jump_line_edit = QLineEdit()
+        self.jump_line_edit.setValidator(QIntValidator(1, 2**31 - 1))
+        self.jump_line_edit.setToolTip("Set number of generations to jump")
+        self.jump_line_edit.setPlaceholderText("Generations...")
+        self.jump_line_edit.setCursor(QCursor(Qt.IBeamCursor))
+        jump_layout.addWidget(self.jump_line_edit)
+
+        self.jump_btn = QPushButton("Jump")
+        self.jump_btn.setToolTip("Jump N generations ahead with HashLife")
+        self.jump_btn.clicked.connect(self.jump_generations)
+        self.jump_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        jump_layout.addWidget(self.jump_btn)
+
+        timeline_layout = QVBoxLayout()
+        timeline_layout.setSpacing(5)
+        sub_layout.addLayout(timeline_layout)
+
+        self.timeline_label = QLabel("Generation 0")
+        timeline_layout.addWidget(self.timeline_label)
+
+        self.timeline_slider = QSlider(Qt.Horizontal)
+        self.timeline_slider.setToolTip("Go back to a previous generation")
+        self.timeline_slider.setRange(0, 0)
+        self.timeline_slider.valueChanged.connect(self.controller.seek_generation)
+        self.timeline_slider.setCursor(QCursor(Qt.PointingHandCursor))
+        timeline_layout.addWidget(self.timeline_slider)
+
+        population_chart = PopulationChart()
+        timeline_layout.addWidget(population_chart)
+
+        pause_on_cycle_check_box = QCheckBox("Pause on cycles")
+        pause_on_cycle_check_box.setToolTip(
+            "Pause the simulation once the grid is static or repeats itself with a "
+            f"period of up to {self.controller.cycle_detector.history_size} "
+            "generations"
+        )
+        pause_on_cycle_check_box.toggled.connect(self.controller.set_pause_on_cycle)
+        pause_on_cycle_check_box.setCursor(QCursor(Qt.PointingHandCursor))
+        timeline_layout.addWidget(pause_on_cycle_check_box)
+
         self.addStretch()
 
         separator = QFrame()
@@ -217,21 +390,150 @@ class ControlLayout(QVBoxLayout):
         close_btn.setCursor(QCursor(Qt.PointingHandCursor))
         self.addWidget(close_btn)
 
+    def update_game_speed_label(self, value: int):
+        speed: int = GAME_SPEEDS[value]
+        self.game_speed_label.setText(
+            f"Game Speed ({speed} gen/s)" if speed else "Game Speed (max)"
+        )
+
+    def update_timeline(
+        self, first_generation: int, last_generation: int, generation: int
+    ):
+        # Moving the slider without seeking the generation again
+        self.timeline_slider.blockSignals(True)
+        self.timeline_slider.setRange(first_generation, last_generation)
+        self.timeline_slider.setValue(generation)
+        self.timeline_slider.blockSignals(False)
+
+        self.timeline_label.setText(f"Generation {generation}")
+        self.timeline_slider.setToolTip(
+            f"Go back to a previous generation, from {first_generation} "
+            f"to {last_generation}"
+        )
+
+    def update_memory_label(self):
+        memory: int = self.controller.estimate_memory(
+            self.rows_spin_box.value(),
+            self.cols_spin_box.value(),
+            self.engine_combo_box.currentText(),
+        )
+        self.memory_label.setText(f"Memory: ~{memory / 2**20:,.0f} MiB")
+
+    def update_grid_size(self, grid: np.ndarray):
+        nb_rows, nb_cols = grid.shape
+        self.rows_spin_box.setValue(nb_rows)
+        self.cols_spin_box.setValue(nb_cols)
+
+    def resize_grid(self):
+        memory: int = self.controller.estimate_memory(
+            self.rows_spin_box.value(),
+            self.cols_spin_box.value(),
+            self.engine_combo_box.currentText(),
+        )
+
+        if memory > MEMORY_WARNING_THRESHOLD:
+            answer: QMessageBox.StandardButton = QMessageBox.question(
+                None,
+                "Resize grid",
+                f"The simulation of this grid would use about {memory / 2**30:,.1f} "
+                "GiB of memory. Resize the grid anyway?",
+            )
+
+            if answer != QMessageBox.Yes:
+                return
+
+        self.controller.resize_grid(
+            self.rows_spin_box.value(), self.cols_spin_box.value()
+        )
+
+    def save_board(self):
+        rules: str = self.rules_combo_box.currentText().strip()
+
+        if not self.controller.check_rules(rules, self.engine_combo_box.currentText()):
+            return
+
+        filename, _ = QFileDialog.getSaveFileName(
+            None, "Save board", "", BOARD_FILE_FILTERS
+        )
+
+        if filename:
+            self.controller.save_board(filename, rules)
+
+    def load_board(self):
+        filename, _ = QFileDialog.getOpenFileName(
+            None, "Load board", "", f"{BOARD_FILE_FILTERS};;All files (*)"
+        )
+
+        if not filename:
+            return
+
+        rulestring: str = self.controller.load_board(filename)
+
+        if rulestring is None:
+            return
+
+        # Selecting the named rules if any, the rulestring otherwise
+        for rules_name, rules in GAME_RULES_REGISTRY.items():
+            if rules is get_game_rules(rulestring):
+                self.rules_combo_box.setCurrentText(rules_name)
+                break
+
+        else:
+            self.rules_combo_box.setCurrentText(rulestring)
+
+    def update_workers_spin_box(self):
+        # Only the parallel engine has worker processes
+        self.workers_spin_box.setEnabled(
+            issubclass(
+                ENGINES_REGISTRY[self.engine_combo_box.currentText()], ParallelEngine
+            )
+        )
+
     def pause_simulation(self):
         self.pause_btn.setEnabled(False)
         self.rules_combo_box.setEnabled(True)
+        self.engine_combo_box.setEnabled(True)
+        self.update_workers_spin_box()
         self.game_speed_slider.setEnabled(True)
         self.iterations_line_edit.setEnabled(True)
         self.iterations_line_edit.setText("")
         self.start_btn.setEnabled(True)
         self.clear_btn.setEnabled(True)
-
-    def start_simulation(self):
+        self.jump_line_edit.setEnabled(True)
+        self.jump_btn.setEnabled(True)
+        self.timeline_slider.setEnabled(True)
+        self.rows_spin_box.setEnabled(True)
+        self.cols_spin_box.setEnabled(True)
+        self.resize_btn.setEnabled(True)
+        self.save_board_btn.setEnabled(True)
+        self.load_board_btn.setEnabled(True)
+
+    def disable_controls(self):
         self.rules_combo_box.setEnabled(False)
+        self.engine_combo_box.setEnabled(False)
+        self.workers_spin_box.setEnabled(False)
         self.game_speed_slider.setEnabled(False)
         self.iterations_line_edit.setEnabled(False)
         self.start_btn.setEnabled(False)
         self.clear_btn.setEnabled(False)
+        self.jump_line_edit.setEnabled(False)
+        self.jump_btn.setEnabled(False)
+        self.timeline_slider.setEnabled(False)
+        self.rows_spin_box.setEnabled(False)
+        self.cols_spin_box.setEnabled(False)
+        self.resize_btn.setEnabled(False)
+        self.save_board_btn.setEnabled(False)
+        self.load_board_btn.setEnabled(False)
+
+    def start_simulation(self):
+        rules: str = self.rules_combo_box.currentText().strip()
+
+        engine: str = self.engine_combo_box.currentText()
+
+        if not self.controller.check_rules(rules, engine):
+            return
+
+        self.disable_controls()
         self.pause_btn.setEnabled(True)
 
         iterations = (
@@ -241,7 +543,21 @@ class ControlLayout(QVBoxLayout):
         )
 
         self.controller.start_simulation(
-            self.rules_combo_box.currentText(),
-            self.game_speed_slider.value(),
+            rules,
+            engine,
+            GAME_SPEEDS[self.game_speed_slider.value()],
             iterations,
         )
+
+    def jump_generations(self):
+        rules: str = self.rules_combo_box.currentText().strip()
+
+        if not self.jump_line_edit.text():
+            return
+
+        if not self.controller.check_rules(rules, self.controller.JUMP_ENGINE):
+            return
+
+        # Enabled again once the jump is finished, as when pausing
+        self.disable_controls()
+        self.controller.jump_generations(rules, int(self.jump_line_edit.text()))
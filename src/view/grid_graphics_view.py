@@ -1,8 +1,10 @@
+import time
 from PyQt5.QtWidgets import QGraphicsView
 from PyQt5.QtCore import Qt, QPoint
-from PyQt5.QtGui import QMouseEvent, QKeyEvent
+from PyQt5.QtGui import QMouseEvent, QKeyEvent, QPaintEvent
 from controller.controller import Controller
 from view.grid_graphics_scene import GridGraphicsScene
+from view.profiling_hud import ProfilingHud
 
 
 class GridGraphicsView(QGraphicsView):
@@ -17,9 +19,7 @@ class GridGraphicsView(QGraphicsView):
             self.disable_preview_pattern
         )
 
-        self.scene: GridGraphicsScene = GridGraphicsScene(
-            self.controller.NB_ROWS, self.controller.NB_COLS
-        )
+        self.scene: GridGraphicsScene = GridGraphicsScene(*self.controller.grid.shape)
         self.setScene(self.scene)
 
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
@@ -27,7 +27,7 @@ class GridGraphicsView(QGraphicsView):
 
         self.scale_factor: float = 1.15
         self.current_scale: float = 1.0
-        self.min_scale: float = 0.3
+        self.min_scale: float = 0.02
         self.max_scale: float = 5.0
 
         self._panning: bool = False
@@ -35,6 +35,10 @@ class GridGraphicsView(QGraphicsView):
 
         self._preview_enabled: bool = False
 
+        # Overlay over the top left corner of the view
+        self.profiling_hud: ProfilingHud = ProfilingHud(self)
+        self.profiling_hud.move(10, 10)
+
     def enable_preview_pattern(self):
         self.setFocus()
         self._preview_enabled = True
@@ -42,15 +46,30 @@ class GridGraphicsView(QGraphicsView):
     def disable_preview_pattern(self):
         self._preview_enabled = False
 
+    def paintEvent(self, event: QPaintEvent):
+        paint_time: float = time.perf_counter()
+        super().paintEvent(event)
+
+        if self.controller.profiler is not None:
+            self.controller.profiler.record("Paint", time.perf_counter() - paint_time)
+
     def wheelEvent(self, event: QMouseEvent):
         if event.angleDelta().y() > 0 and self.current_scale < self.max_scale:
             self.scale(self.scale_factor, self.scale_factor)
             self.current_scale *= self.scale_factor
 
-        elif event.angleDelta().y() < 0 and self.current_scale > self.min_scale:
+        elif event.angleDelta().y() < 0 and self.current_scale > self._get_min_scale():
             self.scale(1 / self.scale_factor, 1 / self.scale_factor)
             self.current_scale /= self.scale_factor
 
+    def _get_min_scale(self) -> float:
+        # Large grids can still be zoomed out until they fit in the view
+        return min(
+            self.min_scale,
+            self.viewport().width() / self.scene.width(),
+            self.viewport().height() / self.scene.height(),
+        )
+
     def mousePressEvent(self, event: QMouseEvent):
         if event.button() == Qt.MiddleButton:
             self._panning = True
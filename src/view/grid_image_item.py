@@ -0,0 +1,293 @@
+import math
+import numpy as np
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem, QWidget
+from PyQt5.QtCore import Qt, QRectF, QLineF
+from PyQt5.QtGui import QImage, QPainter, QPen, QColor
+from PyQt5 import sip
+
+# Values of the image pixels, one pixel per cell
+DEAD: int = 0
+ALIVE: int = 1
+
+# Below these sizes on screen, in pixels, cells are grouped and grid lines hidden
+MIN_CELL_PIXELS: float = 1.0
+MIN_GRID_CELL_PIXELS: float = 4.0
+
+
+# The whole grid is a single item painting an indexed image whose pixels are the
+# cells, the image shares its memory with a NumPy array updated from the grid
+class GridImageItem(QGraphicsItem):
+    def __init__(self, nb_rows: int, nb_cols: int, cell_size: int):
+        super().__init__()
+
+        self.nb_rows: int = nb_rows
+        self.nb_cols: int = nb_cols
+        self.cell_size: int = cell_size
+        self.show_grid: bool = True
+
+        # Image lines must be 32-bit aligned
+        stride: int = -(-nb_cols // 4) * 4
+        self._buffer: np.ndarray = np.zeros((nb_rows, stride), dtype=np.uint8)
+        self.cells: np.ndarray = self._buffer[:, :nb_cols]
+
+        # Passing the address of the array so that the image does not copy it
+        self.image: QImage = QImage(
+            sip.voidptr(self._buffer.ctypes.data),
+            nb_cols,
+            nb_rows,
+            stride,
+            QImage.Format_Indexed8,
+        )
+        self.image.setColorTable([QColor(Qt.white).rgb(), QColor(Qt.black).rgb()])
+
+        # Image of the grid where each pixel is a block of cells, alive if any of its
+        # cells is alive. Only the blocks of the cells changed since it was last
+        # painted are computed again, unless the whole grid has changed.
+        self._reduced_outdated: bool = True
+        self._changed_rows: list[np.ndarray] = []
+        self._changed_cols: list[np.ndarray] = []
+        self._nb_changed_cells: int = 0
+        self._reduced_factor: int = 1
+        self._reduced_buffer: np.ndarray = None
+        self._reduced_image: QImage = None
+
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+    def boundingRect(self) -> QRectF:
+        return QRectF(
+            0, 0, self.nb_cols * self.cell_size, self.nb_rows * self.cell_size
+        )
+
+    def cell_at(self, x: float, y: float) -> tuple[int, int]:
+        row: int = math.floor(y / self.cell_size)
+        col: int = math.floor(x / self.cell_size)
+
+        if 0 <= row < self.nb_rows and 0 <= col < self.nb_cols:
+            return row, col
+
+        return None
+
+    def is_alive(self, row: int, col: int) -> bool:
+        return bool(self.cells[row, col])
+
+    def set_alive(self, row: int, col: int, alive: bool):
+        self.cells[row, col] = ALIVE if alive else DEAD
+        self._add_changed_cells(np.array([row]), np.array([col]))
+        self.update_cells(row, col, row, col)
+
+    def set_cells(self, rows: np.ndarray, cols: np.ndarray, alive: np.ndarray):
+        if not len(rows):
+            return
+
+        self.cells[rows, cols] = alive
+        self._add_changed_cells(rows, cols)
+        self.update_cells(rows.min(), cols.min(), rows.max(), cols.max())
+
+    def clear(self):
+        self.cells.fill(DEAD)
+        self._set_reduced_outdated()
+        self.update()
+
+    def _add_changed_cells(self, rows: np.ndarray, cols: np.ndarray):
+        if self._reduced_outdated:
+            return
+
+        self._changed_rows.append(rows)
+        self._changed_cols.append(cols)
+        self._nb_changed_cells += len(rows)
+
+        # While zoomed in, the reduced image is not painted and the changes would
+        # pile up, past a quarter of the grid it is computed again entirely
+        if self._nb_changed_cells > self.nb_rows * self.nb_cols // 4:
+            self._set_reduced_outdated()
+
+    def _set_reduced_outdated(self):
+        self._reduced_outdated = True
+        self._changed_rows.clear()
+        self._changed_cols.clear()
+        self._nb_changed_cells = 0
+
+    def update_cells(
+        self, first_row: int, first_col: int, last_row: int, last_col: int
+    ):
+        self.update(
+            QRectF(
+                first_col * self.cell_size,
+                first_row * self.cell_size,
+                (last_col - first_col + 1) * self.cell_size,
+                (last_row - first_row + 1) * self.cell_size,
+            )
+        )
+
+    def paint(
+        self,
+        painter: QPainter,
+        option: QStyleOptionGraphicsItem,
+        widget: QWidget = None,
+    ):
+        # Only the cells within the exposed rectangle are painted
+        exposed_rect: QRectF = option.exposedRect
+        first_row: int = max(math.floor(exposed_rect.top() / self.cell_size), 0)
+        first_col: int = max(math.floor(exposed_rect.left() / self.cell_size), 0)
+        last_row: int = min(
+            math.ceil(exposed_rect.bottom() / self.cell_size), self.nb_rows
+        )
+        last_col: int = min(
+            math.ceil(exposed_rect.right() / self.cell_size), self.nb_cols
+        )
+
+        if first_row >= last_row or first_col >= last_col:
+            return
+
+        cell_pixels: float = (
+            option.levelOfDetailFromTransform(painter.worldTransform()) * self.cell_size
+        )
+
+        if cell_pixels < MIN_CELL_PIXELS:
+            # Grouping cells by blocks of a power of two cells per side, so that the
+            # reduced image is reused while zooming in a range of scales
+            factor: int = 1 << math.ceil(math.log2(MIN_CELL_PIXELS / cell_pixels))
+            self._paint_image(
+                painter,
+                self._get_reduced_image(factor),
+                factor,
+                first_row // factor,
+                first_col // factor,
+                -(-last_row // factor),
+                -(-last_col // factor),
+            )
+            return
+
+        self._paint_image(
+            painter, self.image, 1, first_row, first_col, last_row, last_col
+        )
+
+        if self.show_grid and cell_pixels >= MIN_GRID_CELL_PIXELS:
+            self._paint_grid_lines(painter, first_row, first_col, last_row, last_col)
+
+    def _paint_image(
+        self,
+        painter: QPainter,
+        image: QImage,
+        factor: int,
+        first_row: int,
+        first_col: int,
+        last_row: int,
+        last_col: int,
+    ):
+        block_size: int = factor * self.cell_size
+        nb_rows: int = last_row - first_row
+        nb_cols: int = last_col - first_col
+
+        # Blocks of the reduced image may go past the last cells
+        painter.setClipRect(self.boundingRect(), Qt.IntersectClip)
+        painter.drawImage(
+            QRectF(
+                first_col * block_size,
+                first_row * block_size,
+                nb_cols * block_size,
+                nb_rows * block_size,
+            ),
+            image,
+            QRectF(first_col, first_row, nb_cols, nb_rows),
+        )
+
+    def _get_reduced_image(self, factor: int) -> QImage:
+        if self._reduced_outdated or self._reduced_factor != factor:
+            self._reduce_cells(factor)
+
+        elif self._changed_rows:
+            self._reduce_changed_cells(
+                np.concatenate(self._changed_rows), np.concatenate(self._changed_cols)
+            )
+
+        self._changed_rows.clear()
+        self._changed_cols.clear()
+        self._nb_changed_cells = 0
+
+        return self._reduced_image
+
+    def _reduce_cells(self, factor: int):
+        nb_block_rows: int = -(-self.nb_rows // factor)
+        nb_block_cols: int = -(-self.nb_cols // factor)
+        stride: int = -(-nb_block_cols // 4) * 4
+
+        # A block is alive if any of its cells is, reducing the rows first while the
+        # cells are contiguous, then the columns of the much smaller result
+        nb_full_rows: int = self.nb_rows // factor * factor
+        block_rows: np.ndarray = np.zeros(
+            (nb_block_rows, nb_block_cols * factor), dtype=np.uint8
+        )
+        block_rows[: nb_full_rows // factor, : self.nb_cols] = (
+            self.cells[:nb_full_rows].reshape(-1, factor, self.nb_cols).max(axis=1)
+        )
+
+        if nb_full_rows < self.nb_rows:
+            block_rows[-1, : self.nb_cols] = self.cells[nb_full_rows:].max(axis=0)
+
+        self._reduced_buffer = np.zeros((nb_block_rows, stride), dtype=np.uint8)
+        self._reduced_buffer[:, :nb_block_cols] = block_rows.reshape(
+            nb_block_rows, nb_block_cols, factor
+        ).max(axis=2)
+
+        self._reduced_image = QImage(
+            sip.voidptr(self._reduced_buffer.ctypes.data),
+            nb_block_cols,
+            nb_block_rows,
+            stride,
+            QImage.Format_Indexed8,
+        )
+        self._reduced_image.setColorTable(self.image.colorTable())
+        self._reduced_outdated = False
+        self._reduced_factor = factor
+
+    def _reduce_changed_cells(self, rows: np.ndarray, cols: np.ndarray):
+        factor: int = self._reduced_factor
+        nb_block_cols: int = -(-self.nb_cols // factor)
+        blocks: np.ndarray = np.unique(rows // factor * nb_block_cols + cols // factor)
+
+        # Gathering the cells of the blocks is much slower per cell than reducing
+        # the contiguous grid, changes spread over many blocks are reduced at once
+        if len(blocks) * factor * factor > self.nb_rows * self.nb_cols // 16:
+            self._reduce_cells(factor)
+            return
+
+        block_rows, block_cols = np.divmod(blocks, nb_block_cols)
+        offsets: np.ndarray = np.arange(factor)
+
+        # Cells of each block, the blocks of the last rows and columns repeating
+        # their last cells
+        cell_rows: np.ndarray = np.minimum(
+            block_rows[:, None] * factor + offsets, self.nb_rows - 1
+        )
+        cell_cols: np.ndarray = np.minimum(
+            block_cols[:, None] * factor + offsets, self.nb_cols - 1
+        )
+        self._reduced_buffer[block_rows, block_cols] = self.cells[
+            cell_rows[:, :, None], cell_cols[:, None, :]
+        ].max(axis=(1, 2))
+
+    def _paint_grid_lines(
+        self,
+        painter: QPainter,
+        first_row: int,
+        first_col: int,
+        last_row: int,
+        last_col: int,
+    ):
+        # Lines cover the last pixel of each cell, like the gaps between cells
+        top: float = first_row * self.cell_size
+        bottom: float = last_row * self.cell_size
+        left: float = first_col * self.cell_size
+        right: float = last_col * self.cell_size
+
+        lines: list[QLineF] = [
+            QLineF(left, row * self.cell_size - 0.5, right, row * self.cell_size - 0.5)
+            for row in range(first_row + 1, last_row + 1)
+        ] + [
+            QLineF(col * self.cell_size - 0.5, top, col * self.cell_size - 0.5, bottom)
+            for col in range(first_col + 1, last_col + 1)
+        ]
+
+        painter.setPen(QPen(Qt.black, 1))
+        painter.drawLines(lines)
@@ -2,7 +2,10 @@ from PyQt5.QtWidgets import (
     QWidget,
     QMainWindow,
     QHBoxLayout,
+    QShortcut,
 )
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import Qt
 from controller.controller import Controller
 from view.control_layout import ControlLayout
 from view.grid_graphics_view import GridGraphicsView
@@ -34,6 +37,11 @@ class MainWindow(QMainWindow):
         self.graphics_view = GridGraphicsView()
         main_layout.addWidget(self.graphics_view, stretch=1)
 
+        profiling_hud_shortcut = QShortcut(QKeySequence(Qt.Key_F3), self)
+        profiling_hud_shortcut.activated.connect(
+            self.graphics_view.profiling_hud.toggle
+        )
+
         control_widget = QWidget()
         control_widget.setMaximumWidth(267)
         main_layout.addWidget(control_widget)
@@ -1,5 +1,6 @@
 from PyQt5.QtWidgets import QPushButton
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon
 from controller.controller import Controller
 from model.pattern import Pattern
 
@@ -12,8 +13,9 @@ class PatternButton(QPushButton):
         self.pattern: Pattern = pattern
 
         self.setCursor(Qt.PointingHandCursor)
-        self.setIcon(self.pattern.get_icon())
-        self.setIconSize(self.pattern.get_icon().pixmap(40, 40).size())
+        icon: QIcon = self.pattern.get_icon()
+        self.setIcon(icon)
+        self.setIconSize(icon.pixmap(40, 40).size())
         self.setFixedSize(55, 55)
         self.setToolTip(pattern.name)
 
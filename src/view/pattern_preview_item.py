@@ -0,0 +1,74 @@
+import numpy as np
+from PyQt5.QtWidgets import QGraphicsPixmapItem
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap, QColor
+from model.pattern import Pattern
+
+
+# Translucent overlay of a pattern placed under the cursor, the 8 rotations and
+# flips of the pattern are drawn once so moving the preview only moves the item
+class PatternPreviewItem(QGraphicsPixmapItem):
+    def __init__(self, pattern: Pattern, cell_size: int):
+        super().__init__()
+
+        cells: np.ndarray = np.array(pattern.matrix, dtype=bool)
+
+        # Variants indexed by their number of clockwise quarter turns and whether the
+        # pattern is flipped horizontally before turning
+        self._variants: dict[tuple[int, bool], np.ndarray] = {
+            (rotation, flipped): np.rot90(
+                np.fliplr(cells) if flipped else cells, -rotation
+            )
+            for rotation in range(4)
+            for flipped in (False, True)
+        }
+        self._pixmaps: dict[tuple[int, bool], QPixmap] = {
+            key: self._create_pixmap(variant) for key, variant in self._variants.items()
+        }
+        self._rotation: int = 0
+        self._flipped: bool = False
+
+        # One pixel per cell, scaled without smoothing
+        self.setScale(cell_size)
+        self.setTransformationMode(Qt.FastTransformation)
+        self.setZValue(1)
+        self._update_pixmap()
+
+    @property
+    def cells(self) -> np.ndarray:
+        return self._variants[(self._rotation, self._flipped)]
+
+    def rotate(self):
+        self._rotation = (self._rotation + 1) % 4
+        self._update_pixmap()
+
+    def flip_horizontal(self):
+        self._rotation = -self._rotation % 4
+        self._flipped = not self._flipped
+        self._update_pixmap()
+
+    def flip_vertical(self):
+        # Flipping vertically is flipping horizontally then turning twice
+        self._rotation = (2 - self._rotation) % 4
+        self._flipped = not self._flipped
+        self._update_pixmap()
+
+    def _update_pixmap(self):
+        self.setPixmap(self._pixmaps[(self._rotation, self._flipped)])
+
+    def _create_pixmap(self, cells: np.ndarray) -> QPixmap:
+        nb_rows, nb_cols = cells.shape
+
+        # Image lines must be 32-bit aligned
+        stride: int = -(-nb_cols // 4) * 4
+        buffer: np.ndarray = np.zeros((nb_rows, stride), dtype=np.uint8)
+        buffer[:, :nb_cols] = cells
+
+        image: QImage = QImage(
+            buffer.tobytes(), nb_cols, nb_rows, stride, QImage.Format_Indexed8
+        )
+        image.setColorTable(
+            [QColor(Qt.transparent).rgba(), QColor(128, 128, 128, 160).rgba()]
+        )
+
+        return QPixmap.fromImage(image)
@@ -6,7 +6,6 @@ from controller.controller import Controller
 from view.patterns_type_tab import PatternsTypeTab
 from view.pattern_button import PatternButton
 from model.pattern import Pattern
-from utils import load_pattern_from_file
 
 
 class PatternsTabWidget(QTabWidget):
@@ -34,7 +33,9 @@ class PatternsTabWidget(QTabWidget):
         ]
 
         for patterns_type in sorted(patterns_types, key=str.lower):
-            patterns_type_tab: PatternsTypeTab = PatternsTypeTab()
+            patterns_type_tab: PatternsTypeTab = PatternsTypeTab(
+                os.path.join(patterns_dir, patterns_type)
+            )
             patterns_type_tab.setObjectName(patterns_type)
             self.addTab(patterns_type_tab, patterns_type.capitalize())
 
@@ -48,15 +49,6 @@ class PatternsTabWidget(QTabWidget):
                 add_pattern_button.setFixedSize(55, 55)
                 patterns_type_tab.add_pattern_button(add_pattern_button)
 
-            for pattern_name in os.listdir(os.path.join(patterns_dir, patterns_type)):
-                pattern_file: str = os.path.join(
-                    patterns_dir, patterns_type, pattern_name
-                )
-                pattern: Pattern = load_pattern_from_file(pattern_file)
-
-                pattern_button: PatternButton = PatternButton(pattern)
-                patterns_type_tab.add_pattern_button(pattern_button)
-
         self.setTabPosition(QTabWidget.West)
 
     def toggle_buttons(self, enabled: bool):
@@ -71,6 +63,10 @@ class PatternsTabWidget(QTabWidget):
             tab: PatternsTypeTab = self.widget(i)
 
             if tab.objectName().lower() == "customs":
-                pattern_button = PatternButton(pattern)
-                tab.add_pattern_button(pattern_button)
+                # Otherwise the saved pattern is loaded with the tab
+                if tab.patterns_loaded:
+                    pattern_button = PatternButton(pattern)
+                    pattern_button.setEnabled(tab.buttons_enabled)
+                    tab.add_pattern_button(pattern_button)
+
                 break
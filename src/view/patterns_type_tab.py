@@ -1,10 +1,14 @@
+import os
 from PyQt5.QtWidgets import QWidget, QGridLayout
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QShowEvent
 from view.pattern_button import PatternButton
+from model.pattern import Pattern
+from utils import load_pattern_from_file
 
 
 class PatternsTypeTab(QWidget):
-    def __init__(self):
+    def __init__(self, patterns_dir: str):
         super().__init__()
 
         self.grid_layout = QGridLayout()
@@ -15,6 +19,27 @@ class PatternsTypeTab(QWidget):
         self.current_row: int = 0
         self.current_column: int = 0
 
+        # Patterns are loaded after the first time the tab is shown
+        self.patterns_dir: str = patterns_dir
+        self.patterns_loaded: bool = False
+        self.buttons_enabled: bool = True
+
+    def showEvent(self, event: QShowEvent):
+        if not self.patterns_loaded:
+            self.patterns_loaded = True
+            QTimer.singleShot(0, self.load_patterns)
+
+        super().showEvent(event)
+
+    def load_patterns(self):
+        for pattern_name in sorted(os.listdir(self.patterns_dir)):
+            pattern_file: str = os.path.join(self.patterns_dir, pattern_name)
+            pattern: Pattern = load_pattern_from_file(pattern_file)
+
+            pattern_button: PatternButton = PatternButton(pattern)
+            pattern_button.setEnabled(self.buttons_enabled)
+            self.add_pattern_button(pattern_button)
+
     def add_pattern_button(self, pattern_button: PatternButton):
         self.grid_layout.addWidget(
             pattern_button, self.current_row, self.current_column
@@ -26,6 +51,8 @@ class PatternsTypeTab(QWidget):
             self.current_row += 1
 
     def toggle_buttons(self, enabled: bool):
+        self.buttons_enabled = enabled
+
         for i in range(self.grid_layout.count()):
             item = self.grid_layout.itemAt(i)
 
@@ -0,0 +1,153 @@
+import numpy as np
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QTimer, QLineF, QRectF, QPointF
+from PyQt5.QtGui import QPainter, QPaintEvent, QColor, QPen, QPolygonF
+from controller.controller import Controller
+from model.population_statistics import PopulationStatistics
+
+# Population, births and deaths, in the order of the series of the history
+SERIES_COLORS: list[QColor] = [
+    QColor(64, 64, 64),
+    QColor(0, 160, 0),
+    QColor(200, 0, 0),
+]
+
+
+# Chart of the population, births and deaths of the run, under the statistics of the
+# last generation computed and the cycle detected if any. Each bucket of the history
+# is drawn as a vertical line from its minimum to its maximum, so peaks are kept
+# however long the run is.
+class PopulationChart(QWidget):
+    REFRESH_INTERVAL: int = 250
+    # Lines of statistics above the chart, and minimum height of the chart
+    NB_TEXT_LINES: int = 3
+    CHART_HEIGHT: int = 36
+
+    def __init__(self):
+        super().__init__()
+
+        self.controller: Controller = Controller()
+        self.controller.cycle_detected_signal.connect(self.update)
+
+        self.text_height: int = self.NB_TEXT_LINES * self.fontMetrics().lineSpacing()
+        self.setMinimumHeight(self.text_height + self.CHART_HEIGHT)
+        self.setToolTip(
+            "Population (gray), births (green) and deaths (red) since the start of "
+            "the simulation, or since the last edit or generation selected"
+        )
+
+        # Generations of the history at the last refresh
+        self._nb_generations: int = None
+        self._generation: int = None
+        self._cycle: tuple[int, int] = None
+
+        self.timer: QTimer = QTimer()
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(self.REFRESH_INTERVAL)
+
+    def refresh(self):
+        statistics: PopulationStatistics = self.controller.statistics
+
+        cycle: tuple[int, int] = self.controller.cycle_detector.cycle
+
+        # Only repainting when generations have been computed or reset, or when the
+        # cycle detected has changed
+        if (
+            statistics.history.nb_generations != self._nb_generations
+            or statistics.history.first_generation != self._generation
+            or cycle != self._cycle
+        ):
+            self._nb_generations = statistics.history.nb_generations
+            self._generation = statistics.history.first_generation
+            self._cycle = cycle
+            self.update()
+
+    def paintEvent(self, _: QPaintEvent):
+        statistics: PopulationStatistics = self.controller.statistics
+        painter: QPainter = QPainter(self)
+
+        lines: list[str] = [
+            f"Population {statistics.population:,} "
+            f"(+{statistics.births:,} -{statistics.deaths:,})"
+        ]
+
+        if statistics.bounding_box is not None:
+            top, left, bottom, right = statistics.bounding_box
+            lines.append(
+                f"Box {bottom - top + 1}x{right - left + 1} at ({top}, {left})"
+            )
+
+        cycle: tuple[int, int] = self.controller.cycle_detector.cycle
+
+        if cycle is not None:
+            first_generation, period = cycle
+            lines.append(
+                f"Static since gen {first_generation}"
+                if period == 1
+                else f"Period {period} since gen {first_generation}"
+            )
+
+        # Statistics above the chart, which takes the remaining height
+        painter.drawText(
+            QRectF(0, 0, self.width(), self.text_height),
+            Qt.AlignLeft | Qt.AlignTop,
+            "\n".join(lines),
+        )
+
+        chart_rect: QRectF = QRectF(
+            0, self.text_height, self.width(), self.height() - self.text_height
+        ).adjusted(0.5, 0.5, -0.5, -0.5)
+        painter.fillRect(chart_rect, Qt.white)
+        painter.setPen(QColor(160, 160, 160))
+        painter.drawRect(chart_rect)
+
+        _, minimums, maximums = statistics.history.get_buckets()
+
+        if len(minimums):
+            self._paint_buckets(painter, chart_rect, minimums, maximums)
+
+    def _paint_buckets(
+        self,
+        painter: QPainter,
+        chart_rect: QRectF,
+        minimums: np.ndarray,
+        maximums: np.ndarray,
+    ):
+        nb_buckets: int = len(minimums)
+
+        # Buckets spread over the whole width, values from 0 to the highest one
+        x: np.ndarray = (
+            chart_rect.left()
+            + 1
+            + np.arange(nb_buckets)
+            * ((chart_rect.width() - 2) / max(nb_buckets - 1, 1))
+        )
+        scale: float = (chart_rect.height() - 2) / max(int(maximums.max()), 1)
+        bottom: float = chart_rect.bottom() - 1
+
+        # Births and deaths are drawn over the population
+        for series, color in enumerate(SERIES_COLORS):
+            low: np.ndarray = bottom - minimums[:, series] * scale
+            high: np.ndarray = bottom - maximums[:, series] * scale
+
+            painter.setPen(QPen(color, 1))
+
+            # Joining the buckets, then spanning the values of each bucket
+            for values in (low, high):
+                painter.drawPolyline(
+                    QPolygonF(
+                        [
+                            QPointF(bucket_x, value)
+                            for bucket_x, value in zip(x.tolist(), values.tolist())
+                        ]
+                    )
+                )
+
+            painter.drawLines(
+                [
+                    QLineF(bucket_x, bucket_low, bucket_x, bucket_high)
+                    for bucket_x, bucket_low, bucket_high in zip(
+                        x.tolist(), low.tolist(), high.tolist()
+                    )
+                ]
+            )
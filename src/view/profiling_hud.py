@@ -0,0 +1,147 @@
+import time
+from PyQt5.QtWidgets import (
+    QFrame,
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QSpinBox,
+    QPushButton,
+)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QCursor
+from controller.controller import Controller
+from controller.simulation_thread import SimulationThread
+
+
+# Overlay showing the mean and 95th percentile durations of the phases of the last
+# generations, and the generations per second achieved against the requested ones
+class ProfilingHud(QFrame):
+    REFRESH_INTERVAL: int = 500
+
+    def __init__(self, parent: QWidget):
+        super().__init__(parent)
+
+        self.controller: Controller = Controller()
+        self.controller.profile_saved_signal.connect(self.show_saved_profile)
+
+        self.timer: QTimer = QTimer()
+        self.timer.timeout.connect(self.update_statistics)
+
+        # Iteration of the simulation thread at the previous refresh
+        self._thread: SimulationThread = None
+        self._last_iteration: int = 0
+        self._last_time: float = 0
+
+        self.create_ui()
+        self.hide()
+
+    def create_ui(self):
+        self.setStyleSheet(
+            """
+            ProfilingHud {
+                background-color: rgba(0, 0, 0, 180);
+                border-radius: 5px;
+            }
+            QLabel {
+                color: white;
+                font-family: monospace;
+            }
+            """
+        )
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(10, 10, 10, 10)
+        self.setLayout(layout)
+
+        self.statistics_label = QLabel()
+        layout.addWidget(self.statistics_label)
+
+        profile_layout = QHBoxLayout()
+        layout.addLayout(profile_layout)
+
+        self.profile_spin_box = QSpinBox()
+        self.profile_spin_box.setRange(1, 1000000)
+        self.profile_spin_box.setValue(100)
+        self.profile_spin_box.setSuffix(" gen")
+        self.profile_spin_box.setToolTip("Set number of generations to profile")
+        profile_layout.addWidget(self.profile_spin_box)
+
+        profile_btn = QPushButton("Profile")
+        profile_btn.setToolTip(
+            "Profile the next generations of the simulation with cProfile"
+        )
+        profile_btn.clicked.connect(self.capture_profile)
+        profile_btn.setCursor(QCursor(Qt.PointingHandCursor))
+        profile_layout.addWidget(profile_btn)
+
+        self.profile_label = QLabel()
+        self.profile_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.profile_label.hide()
+        layout.addWidget(self.profile_label)
+
+    def toggle(self):
+        visible: bool = not self.isVisible()
+        self.setVisible(visible)
+        self.controller.set_profiling(visible)
+
+        if visible:
+            self.update_statistics()
+            self.timer.start(self.REFRESH_INTERVAL)
+
+        else:
+            self.timer.stop()
+
+    def update_statistics(self):
+        thread: SimulationThread = self.controller.simulation_thread
+        current_time: float = time.perf_counter()
+        achieved_speed: str = "-"
+        requested_speed: str = "paused"
+
+        if thread is not None:
+            requested_speed = f"{thread.speed:,} gen/s" if thread.speed else "max"
+
+            # The speed is measured from the second refresh of each simulation
+            if thread is self._thread:
+                speed: float = (thread.current_iteration - self._last_iteration) / (
+                    current_time - self._last_time
+                )
+                achieved_speed = f"{speed:,.0f} gen/s"
+
+            self._last_iteration = thread.current_iteration
+
+        self._thread = thread
+        self._last_time = current_time
+
+        lines: list[str] = [
+            f"{'Achieved':<14}{achieved_speed:>18}",
+            f"{'Requested':<14}{requested_speed:>18}",
+            "",
+            f"{'Phase (ms)':<14}{'mean':>9}{'p95':>9}",
+        ]
+        statistics: dict[str, tuple[float, float]] = (
+            self.controller.profiler.get_statistics()
+            if self.controller.profiler is not None
+            else {}
+        )
+
+        for phase, (mean, percentile) in statistics.items():
+            lines.append(f"{phase:<14}{mean * 1000:>9.3f}{percentile * 1000:>9.3f}")
+
+        self.statistics_label.setText("\n".join(lines))
+        self.adjustSize()
+
+    def capture_profile(self):
+        nb_generations: int = self.profile_spin_box.value()
+        self.controller.capture_profile(nb_generations)
+
+        self.profile_label.setText(f"Profiling the next {nb_generations:,} gen...")
+        self.profile_label.show()
+        self.adjustSize()
+
+    def show_saved_profile(self, filename: str):
+        self.profile_label.setText(
+            f"Profile saved to\n{filename}" if filename else "Profile not saved"
+        )
+        self.profile_label.show()
+        self.adjustSize()
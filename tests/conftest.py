@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules of the application import each other relatively to src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
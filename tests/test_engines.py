@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from engine.engine import Engine
+from engine.engines_registry import create_engine
+from game_rules import GAME_RULES_REGISTRY, parse_rulestring
+
+DENSE_ENGINE: str = "NumPy (dense)"
+BOUNDED_ENGINES: list[str] = [
+    "Bit-packed (64 cells/word)",
+    "Tiled (active regions)",
+    "Parallel (all cores)",
+]
+UNBOUNDED_ENGINES: list[str] = ["HashLife (unbounded)", "Sparse (unbounded)"]
+NB_STEPS: int = 8
+
+
+def create_soup(nb_rows: int, nb_cols: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).random((nb_rows, nb_cols)) < 0.4
+
+
+def step_naively(grid: np.ndarray, rulestring: str) -> np.ndarray:
+    # Counting the neighbors of each cell one by one, cells outside the grid are dead
+    birth, survival = parse_rulestring(rulestring)
+    nb_rows, nb_cols = grid.shape
+    next_grid: np.ndarray = np.zeros_like(grid)
+
+    for row in range(nb_rows):
+        for col in range(nb_cols):
+            nb_neighbors: int = int(
+                grid[max(row - 1, 0) : row + 2, max(col - 1, 0) : col + 2].sum()
+            ) - int(grid[row, col])
+            next_grid[row, col] = nb_neighbors in (
+                survival if grid[row, col] else birth
+            )
+
+    return next_grid
+
+
+def run_engine(
+    engine_name: str, rules_name: str, grid: np.ndarray, nb_steps: int
+) -> list[np.ndarray]:
+    # Grids of the generations 1 to nb_steps, or a skip for unsupported rules
+    try:
+        engine: Engine = create_engine(engine_name, GAME_RULES_REGISTRY[rules_name], 2)
+
+    except ValueError as error:
+        pytest.skip(str(error))
+
+    try:
+        engine.set_grid(grid)
+        grids: list[np.ndarray] = []
+
+        for _ in range(nb_steps):
+            engine.step()
+            grids.append(engine.get_grid().copy())
+
+    finally:
+        engine.close()
+
+    return grids
+
+
+@pytest.mark.parametrize("rules_name", GAME_RULES_REGISTRY)
+def test_rules_match_naive_reference(rules_name: str):
+    # The rulestring in the name of the rules is the reference
+    rulestring: str = rules_name[rules_name.index("(") + 1 : -1]
+    rules = GAME_RULES_REGISTRY[rules_name]
+
+    for seed in range(3):
+        grid: np.ndarray = create_soup(23, 37, seed)
+
+        for _ in range(NB_STEPS):
+            next_grid: np.ndarray = step_naively(grid, rulestring)
+            assert np.array_equal(rules(grid), next_grid)
+            grid = next_grid
+
+
+@pytest.mark.parametrize("rules_name", GAME_RULES_REGISTRY)
+@pytest.mark.parametrize("engine_name", BOUNDED_ENGINES)
+def test_bounded_engine_matches_dense(engine_name: str, rules_name: str):
+    # Sizes not multiple of the words and tiles, with cells on the edges
+    grid: np.ndarray = create_soup(67, 131, 1)
+    expected_grids: list[np.ndarray] = run_engine(
+        DENSE_ENGINE, rules_name, grid, NB_STEPS
+    )
+
+    for generation, engine_grid in enumerate(
+        run_engine(engine_name, rules_name, grid, NB_STEPS), 1
+    ):
+        assert np.array_equal(engine_grid, expected_grids[generation - 1]), generation
+
+
+@pytest.mark.parametrize("rules_name", GAME_RULES_REGISTRY)
+@pytest.mark.parametrize("engine_name", UNBOUNDED_ENGINES)
+def test_unbounded_engine_matches_dense(engine_name: str, rules_name: str):
+    # A pattern grows by a cell per generation at most, the soup in the center stays
+    # away from the edges, where the dense engine differs from the unbounded ones
+    grid: np.ndarray = np.zeros((64, 64), dtype=bool)
+    grid[26:38, 26:38] = create_soup(12, 12, 2)
+    expected_grids: list[np.ndarray] = run_engine(
+        DENSE_ENGINE, rules_name, grid, NB_STEPS
+    )
+
+    for generation, engine_grid in enumerate(
+        run_engine(engine_name, rules_name, grid, NB_STEPS), 1
+    ):
+        assert np.array_equal(engine_grid, expected_grids[generation - 1]), generation
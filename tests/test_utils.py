@@ -0,0 +1,33 @@
+import pytest
+from utils import load_rle_cells
+
+
+def test_load_rle_cells_empty_file(tmp_path):
+    filename: str = str(tmp_path / "empty.rle")
+    open(filename, "wb").close()
+
+    with pytest.raises(ValueError, match="missing its size line"):
+        load_rle_cells(filename)
+
+
+def test_load_rle_cells_comments_only(tmp_path):
+    filename: str = str(tmp_path / "comments.rle")
+
+    with open(filename, "w", encoding="UTF-8") as file:
+        file.write("#N Comments only\n#C No size line\n")
+
+    with pytest.raises(ValueError, match="missing its size line"):
+        load_rle_cells(filename)
+
+
+def test_load_rle_cells_glider(tmp_path):
+    filename: str = str(tmp_path / "glider.rle")
+
+    with open(filename, "w", encoding="UTF-8") as file:
+        file.write("#N Glider\nx = 3, y = 3, rule = B3/S23\nbob$2bo$3o!\n")
+
+    name, cells, rule = load_rle_cells(filename)
+
+    assert name == "Glider"
+    assert rule == "B3/S23"
+    assert cells.astype(int).tolist() == [[0, 1, 0], [0, 0, 1], [1, 1, 1]]